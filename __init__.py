@@ -4,14 +4,41 @@ from .nodes import (UmiAIWildcardNode, UmiSaveImage, UmiPoseGenerator, UmiEmotio
                     UmiPositionControl as UmiPositionControl2, UmiVisualCameraControl as UmiVisualCameraControl2)
 from .nodes_lite import UmiAIWildcardNodeLite
 from .nodes_model_manager import UmiModelManager, UmiModelSelector
+from .shared_utils import _atomic_write_json, _read_json_file, _json_body, _json_response
 from server import PromptServer
 from aiohttp import web
 import os
+import asyncio
+import functools
 import importlib.util
 import glob
+import io
+import hashlib
+import itertools
+import json
+import re
+import threading
 import yaml
+from collections import OrderedDict
 import folder_paths # New Import for LoRA scanning
 
+# Same loader the nodes use: libyaml-backed when PyYAML was built with it
+from .shared_utils import _YamlLoader, _NeedFullParse, _scalar_text, _skip_node, _parse_yaml_tags_cached, _load_yaml_cached
+if _YamlLoader is yaml.SafeLoader:
+    print("[UmiAI] PyYAML has no libyaml bindings; wildcard YAML parsing will be slower. "
+          "Reinstall PyYAML with libyaml support to speed it up.")
+
+# Optional: orjson encodes the large autocomplete payloads much faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
 try:
     from . import umi_utilities as _umi_utilities
 except Exception:
@@ -92,59 +119,195 @@ def _filter_models_for_core(config):
         filtered.append(model)
     return {**config, "models": filtered}
 
+# Cached wildcard scan, keyed by a signature of the tree's txt/yaml files
+# 'paths' maps lowercase rel name and basename -> file path for preview lookups
+_WC_CACHE = {'sig': None, 'data': None, 'paths': None}
+
+# Only .txt/.yaml feed autocomplete; .yml/.csv are walked too so previews of them hit the index
+_PREVIEW_EXTENSIONS = ('.txt', '.yaml', '.yml', '.csv')
+
+def _iter_wildcard_files(root):
+    """Yield a DirEntry for every non-hidden file below root, in glob order."""
+    try:
+        stack = [os.scandir(root)]
+    except OSError:
+        return
+    # One open scandir iterator per directory level instead of nested generators
+    try:
+        while stack:
+            entry = next(stack[-1], None)
+            if entry is None:
+                stack.pop().close()
+                continue
+            if entry.name.startswith('.'):
+                continue
+            if entry.is_dir():
+                try:
+                    stack.append(os.scandir(entry.path))
+                except OSError:
+                    pass
+            elif entry.is_file():
+                yield entry
+    finally:
+        for it in stack:
+            it.close()
+
+def _wildcard_tree_signature(wildcards_path):
+    """Hash (path, mtime, size) of every wildcard file without opening any of them.
+
+    Returns (digest, entries) so a rescan can reuse the walk.
+    """
+    h = xxhash.xxh3_64() if xxhash is not None else hashlib.blake2b(digest_size=8)
+    entries = []
+    for entry in _iter_wildcard_files(wildcards_path):
+        if entry.name.endswith(_PREVIEW_EXTENSIONS):
+            entries.append(entry)
+            st = entry.stat()
+            h.update(entry.path.encode('utf-8', 'surrogateescape') + b'\0')
+            h.update(st.st_mtime_ns.to_bytes(8, 'little', signed=True))
+            h.update(st.st_size.to_bytes(8, 'little'))
+    return h.digest(), entries
+
 def get_wildcard_data():
     wildcards_path = os.path.join(os.path.dirname(__file__), "wildcards")
+    sig, entries = _wildcard_tree_signature(wildcards_path) if os.path.exists(wildcards_path) else (None, None)
+    if sig is None or sig != _WC_CACHE['sig'] or _WC_CACHE['data'] is None:
+        _WC_CACHE['data'], _WC_CACHE['paths'] = _scan_wildcard_data(wildcards_path, entries)
+        _WC_CACHE['sig'] = sig
+    # LoRAs are not part of the wildcard tree; folder_paths keeps its own cache
+    return {**_WC_CACHE['data'], "loras": folder_paths.get_filename_list("loras")}
+
+# Persistent index of tags per YAML file, stored under wildcards/.cache
+_TAG_CACHE_VERSION = 1
+_TAG_PARSE_WORKERS = 8
+
+def _load_or_build_tag_cache(wildcards_path, yaml_paths):
+    """Load .cache/tags.json, reparse stale or missing YAMLs, and rewrite it if anything changed."""
+    cache_path = os.path.join(wildcards_path, ".cache", "tags.json")
+    cached_files = {}
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if isinstance(cached, dict) and cached.get('version') == _TAG_CACHE_VERSION:
+            cached_files = cached.get('files') or {}
+    except (OSError, ValueError):
+        pass
+
+    files = {}
+    stale = []
+    prefix_len = len(wildcards_path) + 1
+    for filepath in yaml_paths:
+        rel_path = filepath[prefix_len:]
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            continue
+        entry = cached_files.get(rel_path)
+        # Placeholder keeps files in walk order; stale slots are filled in below
+        files[rel_path] = entry
+        if not (entry and entry.get('mtime') == st.st_mtime_ns and entry.get('size') == st.st_size):
+            stale.append((rel_path, filepath, st))
+
+    def parse(item):
+        rel_path, filepath, st = item
+        try:
+            # Shared with the nodes.py listing, so a YAML one of them parsed isn't parsed again
+            tags, keys = _parse_yaml_tags_cached(filepath, st)
+        except Exception as e:
+            print(f"[UmiAI] Error parsing YAML {filepath}: {e}")
+            return rel_path, None
+        return rel_path, {'mtime': st.st_mtime_ns, 'size': st.st_size, 'tags': tags, 'keys': keys}
+
+    if len(stale) > 1:
+        # Cold index: overlap the file reads of many YAMLs (e.g. on network drives)
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=min(_TAG_PARSE_WORKERS, len(stale))) as pool:
+            parsed = list(pool.map(parse, stale))
+    else:
+        parsed = [parse(item) for item in stale]
+    dirty = False
+    for rel_path, entry in parsed:
+        if entry is None:
+            del files[rel_path]
+        else:
+            files[rel_path] = entry
+            dirty = True
+
+    if dirty or files.keys() != cached_files.keys():
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            _atomic_write_json(cache_path, {'version': _TAG_CACHE_VERSION, 'files': files}, indent=None)
+        except OSError as e:
+            print(f"[UmiAI] Could not write tag cache {cache_path}: {e}")
+    return files
+
+def _scan_wildcard_data(wildcards_path, entries=None):
     txt_files = []      # For __ autocomplete (txt files only)
     yaml_files = []     # YAML file names
-    tags = set()        # Tags from YAML files for <[ autocomplete
+    tags = {}           # Tags from YAML files for <[ autocomplete (dict as an ordered set)
     basenames = {}      # Maps basename -> full path for quick lookup
+    paths = {}          # Lowercase rel name / basename -> file path, for previews
     
     if os.path.exists(wildcards_path):
-        # 1. Scan TXT files (for __ wildcards)
-        for filepath in glob.glob(os.path.join(wildcards_path, '**', '*.txt'), recursive=True):
-            rel_path = os.path.relpath(filepath, wildcards_path)
-            tag_name = os.path.splitext(rel_path)[0].replace(os.sep, '/')
+        # Single pass over the tree, split by extension
+        # Entry paths all start with "<wildcards_path><sep>", so slice instead of relpath/splitext
+        prefix_len = len(wildcards_path) + 1
+        by_ext = {ext: [] for ext in _PREVIEW_EXTENSIONS}
+        if entries is None:
+            entries = _iter_wildcard_files(wildcards_path)
+        for entry in entries:
+            ext = os.path.splitext(entry.name)[1]
+            if ext in by_ext:
+                by_ext[ext].append(entry)
+        txt_entries = by_ext['.txt']
+        yaml_entries = by_ext['.yaml']
+        yaml_paths = [entry.path for entry in yaml_entries]
+
+        # Same precedence as a preview probe: txt, yaml, yml, csv at the exact rel name, then any basename
+        for ext, ext_entries in by_ext.items():
+            for entry in ext_entries:
+                paths.setdefault(entry.path[prefix_len:-len(ext)].replace(os.sep, '/').lower(), entry.path)
+        for entry in itertools.chain.from_iterable(by_ext.values()):
+            paths.setdefault(os.path.splitext(entry.name)[0].lower(), entry.path)
+
+        # 1. TXT files (for __ wildcards)
+        for entry in txt_entries:
+            tag_name = entry.path[prefix_len:-4].replace(os.sep, '/')
             txt_files.append(tag_name)
             
             # Add basename mapping (filename without extension)
-            basename = os.path.splitext(os.path.basename(filepath))[0]
+            basename = entry.name[:-4]
             if basename not in basenames:
                 basenames[basename] = tag_name
         
-        # 2. Scan YAML files (for tags)
-        for filepath in glob.glob(os.path.join(wildcards_path, '**', '*.yaml'), recursive=True):
-            rel_path = os.path.relpath(filepath, wildcards_path)
-            tag_name = os.path.splitext(rel_path)[0].replace(os.sep, '/')
+        # 2. YAML files (for tags)
+        for entry in yaml_entries:
+            tag_name = entry.path[prefix_len:-5].replace(os.sep, '/')
             yaml_files.append(tag_name)
             
             # Add basename mapping
-            basename = os.path.splitext(os.path.basename(filepath))[0]
+            basename = entry.name[:-5]
             if basename not in basenames:
                 basenames[basename] = tag_name
             
-            # Parse YAML for Tags
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    data = yaml.safe_load(f)
-                    if isinstance(data, dict):
-                        for entry in data.values():
-                            if isinstance(entry, dict) and 'Tags' in entry:
-                                for t in entry['Tags']:
-                                    tags.add(str(t).strip())
-            except Exception as e:
-                print(f"[UmiAI] Error parsing YAML {filepath}: {e}")
-
-    # Return separated data
-    return {
-        "files": sorted(txt_files),           # Legacy/combined (for backwards compat)
-        "wildcards": sorted(txt_files),       # TXT files only (for __ autocomplete)
+        # Tags come from the on-disk index; only new or changed YAMLs get parsed
+        tag_cache = _load_or_build_tag_cache(wildcards_path, yaml_paths)
+        for cached in tag_cache.values():
+            tags.update(dict.fromkeys(cached['tags']))
+
+    # Return separated data; both TXT keys share one sorted list
+    txt_sorted = sorted(txt_files)
+    return ({
+        "files": txt_sorted,                  # Legacy/combined (for backwards compat)
+        "wildcards": txt_sorted,              # TXT files only (for __ autocomplete)
         "yaml_files": sorted(yaml_files),     # YAML file names
-        "tags": sorted(list(tags)),           # Tags from YAML (for <[ autocomplete)
+        "tags": sorted(tags),                 # Tags from YAML (for <[ autocomplete)
         "basenames": basenames,               # Basename -> full path mapping
-        "loras": folder_paths.get_filename_list("loras")
-    }
+    }, paths)
 
-def get_optional_dependency_status():
+@functools.lru_cache(maxsize=1)
+def _probe_optional_dependencies():
+    # find_spec walks every sys.path finder; availability can't change without a restart
     dependencies = {
         "opencv-python": "cv2",
         "transformers": "transformers",
@@ -158,62 +321,76 @@ def get_optional_dependency_status():
             missing.append(package_name)
         else:
             installed.append(package_name)
-    return {"installed": installed, "missing": missing}
+    return tuple(installed), tuple(missing)
+
+def get_optional_dependency_status():
+    installed, missing = _probe_optional_dependencies()
+    return {"installed": list(installed), "missing": list(missing)}
 
 # Register the routes (aligned with nodes.py endpoints)
 @PromptServer.instance.routes.get("/umiapp/wildcards")
 async def fetch_wildcards(request):
-    data = get_wildcard_data()
-    return web.json_response(data)
+    loop = asyncio.get_running_loop()
+    data = await loop.run_in_executor(None, get_wildcard_data)
+    return _json_response(data)
+
+def _read_globals(path, label):
+    """$-prefixed variables from one globals.yaml; {} if it is missing or unreadable."""
+    try:
+        data = _load_yaml_cached(path)
+        if not isinstance(data, dict):
+            return {}
+        # Store variable name (with $ prefix) and its value
+        return {key if key.startswith('$') else f'${key}': str(value) for key, value in data.items()}
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"[UmiAI] Error loading {label}: {e}")
+    return {}
+
+def _load_globals():
+    """Merge globals.yaml variables from the extension and models/wildcards folders."""
+    wildcards_path = os.path.join(os.path.dirname(__file__), "wildcards")
+    globals_path = os.path.join(wildcards_path, "globals.yaml")
+    models_globals = os.path.join(folder_paths.models_dir, "wildcards", "globals.yaml")
+
+    # models/wildcards first, then the extension's own globals override it in one update
+    variables = _read_globals(models_globals, "models globals.yaml")
+    variables.update(_read_globals(globals_path, "globals.yaml"))
+    return variables
 
 @PromptServer.instance.routes.get("/umiapp/globals")
 async def fetch_globals(request):
     """Fetch global variables from globals.yaml for autocomplete."""
-    wildcards_path = os.path.join(os.path.dirname(__file__), "wildcards")
-    globals_path = os.path.join(wildcards_path, "globals.yaml")
-    variables = {}
-    
-    if os.path.exists(globals_path):
-        try:
-            with open(globals_path, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
-                if isinstance(data, dict):
-                    for key, value in data.items():
-                        # Store variable name (with $ prefix) and its value
-                        var_name = key if key.startswith('$') else f'${key}'
-                        variables[var_name] = str(value)
-        except Exception as e:
-            print(f"[UmiAI] Error loading globals.yaml: {e}")
-    
-    # Also check models/wildcards for globals
-    models_wildcards = os.path.join(folder_paths.models_dir, "wildcards")
-    models_globals = os.path.join(models_wildcards, "globals.yaml")
-    
-    if os.path.exists(models_globals):
-        try:
-            with open(models_globals, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
-                if isinstance(data, dict):
-                    for key, value in data.items():
-                        var_name = key if key.startswith('$') else f'${key}'
-                        if var_name not in variables:  # Don't override
-                            variables[var_name] = str(value)
-        except Exception as e:
-            print(f"[UmiAI] Error loading models globals.yaml: {e}")
-    
-    return web.json_response({
+    loop = asyncio.get_running_loop()
+    variables = await loop.run_in_executor(None, _load_globals)
+    return _json_response({
         "variables": variables,
         "count": len(variables)
     })
 
 @PromptServer.instance.routes.get("/umiapp/deps")
 async def get_dependency_status(request):
-    return web.json_response(get_optional_dependency_status())
+    loop = asyncio.get_running_loop()
+    return web.json_response(await loop.run_in_executor(None, get_optional_dependency_status))
 
 @PromptServer.instance.routes.get("/umiapp/utilities/status")
 async def get_utilities_status(request):
     return web.json_response({"installed": _umi_utilities is not None})
 
+def _character_profile(character_loader, char_name):
+    data = character_loader.load_character(char_name)
+    if not data:
+        return None
+    return {
+        "name": data.get('name', char_name),
+        "description": data.get('description', ''),
+        "lora": data.get('lora', ''),
+        "outfits": list(data.get('outfits', {}).keys()),
+        "emotions": list(data.get('emotions', {}).keys()),
+        "poses": list(data.get('poses', {}).keys()),
+    }
+
 @PromptServer.instance.routes.get("/umiapp/characters")
 async def fetch_characters(request):
     """Fetch available characters and their profiles for autocomplete and external tools."""
@@ -225,29 +402,36 @@ async def fetch_characters(request):
             "count": 0
         })
     
-    characters = character_loader.list_characters()
-    character_data = {}
-    
-    for char_name in characters:
-        if char_name == "none":
-            continue
-        data = character_loader.load_character(char_name)
-        if data:
-            character_data[char_name] = {
-                "name": data.get('name', char_name),
-                "description": data.get('description', ''),
-                "lora": data.get('lora', ''),
-                "outfits": list(data.get('outfits', {}).keys()),
-                "emotions": list(data.get('emotions', {}).keys()),
-                "poses": list(data.get('poses', {}).keys()),
-            }
+    # Each profile is its own file read; load them side by side in the default executor
+    loop = asyncio.get_running_loop()
+    characters = await loop.run_in_executor(None, character_loader.list_characters)
+    names = [char_name for char_name in characters if char_name != "none"]
+    profiles = await asyncio.gather(*(loop.run_in_executor(None, _character_profile, character_loader, char_name)
+                                      for char_name in names))
+    character_data = {char_name: profile for char_name, profile in zip(names, profiles) if profile}
     
-    return web.json_response({
+    return _json_response({
         "characters": list(character_data.keys()),
         "profiles": character_data,
         "count": len(character_data)
     })
 
+# Costume folder listings keyed by Sheets path -> (dir mtime, names)
+_COSTUME_CACHE = {}
+
+def _list_costumes(sheets_path):
+    try:
+        mtime = os.stat(sheets_path).st_mtime_ns
+    except OSError:
+        return []
+    cached = _COSTUME_CACHE.get(sheets_path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with os.scandir(sheets_path) as it:
+        costumes = [entry.name for entry in it if entry.is_dir()]
+    _COSTUME_CACHE[sheets_path] = (mtime, costumes)
+    return costumes
+
 # VNCCS-style costume API
 @PromptServer.instance.routes.get("/umiapp/character/costumes")
 async def get_character_costumes(request):
@@ -259,29 +443,94 @@ async def get_character_costumes(request):
     chars_path = _resolve_umi_asset_path("characters", character)
     sheets_path = os.path.join(chars_path, "Sheets")
     
-    costumes = []
-    if os.path.exists(sheets_path):
-        for item in os.listdir(sheets_path):
-            if os.path.isdir(os.path.join(sheets_path, item)):
-                costumes.append(item)
-    
-    return web.json_response(costumes)
+    return _json_response(_list_costumes(sheets_path))
 
-# VNCCS-style character sheet preview
-@PromptServer.instance.routes.get("/umiapp/character/preview")
-async def get_character_preview(request):
-    """Get cropped preview from character sheet (VNCCS-compatible)."""
-    import io
-    import re
+_SHEET_IDX_RE = re.compile(r'(\d+)')
+
+def _sheet_idx(f, _re=_SHEET_IDX_RE):
+    m = _re.search(os.path.basename(f))
+    return int(m.group(1)) if m else 0
+
+def _crop_sheet_preview(best_file):
+    """Crop the preview cell out of a sheet image."""
     from PIL import Image
-    
-    character = request.query.get("character", "")
-    if not character:
-        return web.Response(status=404, text="No character specified")
-    
-    chars_path = _resolve_umi_asset_path("characters", character)
-    
-    # Try to find a sheet image
+
+    # Crop: Sheet is 6x2 grid, get last cell (row 1, col 5)
+    with Image.open(best_file) as img:
+        w, h = img.size
+        item_w = w // 6
+        item_h = h // 2
+        
+        row, col = 1, 5
+        left = col * item_w
+        upper = row * item_h
+        right = left + item_w
+        lower = upper + item_h
+        
+        return img.crop((left, upper, right, lower))
+
+_PREVIEW_TLS = threading.local()
+
+def _preview_buffer():
+    """Per-thread BytesIO for uncached preview encodes, emptied before each use."""
+    buf = getattr(_PREVIEW_TLS, 'buf', None)
+    if buf is None:
+        buf = _PREVIEW_TLS.buf = io.BytesIO()
+    buf.seek(0)
+    buf.truncate()
+    return buf
+
+# Encoded previews for characters whose .cache dir isn't writable: (sheet path, mtime_ns) -> PNG bytes
+_PREVIEW_MEM = OrderedDict()
+_PREVIEW_MEM_MAX = 64
+_PREVIEW_MEM_LOCK = threading.Lock()
+
+def _sheet_preview(chars_path, best_file):
+    """Return (cache_path, None) for a cached preview PNG, or (None, png_bytes) if it can't be cached."""
+    st = os.stat(best_file)
+    cache_dir = os.path.join(chars_path, ".cache")
+    stem = os.path.splitext(os.path.basename(best_file))[0]
+    cache_path = os.path.join(cache_dir, f"preview_{stem}_{st.st_mtime_ns}.png")
+    if os.path.exists(cache_path):
+        return cache_path, None
+    mem_key = (best_file, st.st_mtime_ns)
+    with _PREVIEW_MEM_LOCK:
+        body = _PREVIEW_MEM.get(mem_key)
+        if body is not None:
+            _PREVIEW_MEM.move_to_end(mem_key)
+            return None, body
+
+    crop = _crop_sheet_preview(best_file)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Drop older revisions of this sheet only; other sheets' previews may be in use by concurrent requests
+        prefix = f"preview_{stem}_"
+        for old_path in glob.glob(os.path.join(glob.escape(cache_dir), f"{glob.escape(prefix)}*.png")):
+            # The suffix must be an mtime, so sheet "a" doesn't remove previews of sheet "a_b"
+            if old_path == cache_path or not os.path.basename(old_path)[len(prefix):-4].isdigit():
+                continue
+            try:
+                os.remove(old_path)
+            except OSError:
+                pass
+        tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        crop.save(tmp_path, format='PNG', compress_level=1)
+        os.replace(tmp_path, cache_path)
+        return cache_path, None
+    except OSError as e:
+        print(f"[UmiAI] Could not cache character preview in {cache_dir}: {e}")
+
+    buf = _preview_buffer()
+    crop.save(buf, format='PNG', compress_level=1)
+    body = buf.getvalue()
+    with _PREVIEW_MEM_LOCK:
+        _PREVIEW_MEM[mem_key] = body
+        while len(_PREVIEW_MEM) > _PREVIEW_MEM_MAX:
+            _PREVIEW_MEM.popitem(last=False)
+    return None, body
+
+def _find_sheet_file(chars_path):
+    """Return (sheet_path, None) for a character's highest-index sheet, or (None, reason)."""
     sheet_dir = os.path.join(chars_path, "Sheets", "Naked", "neutral")
     if not os.path.exists(sheet_dir):
         # Try any costume
@@ -294,7 +543,7 @@ async def get_character_preview(request):
                     break
     
     if not os.path.exists(sheet_dir):
-        return web.Response(status=404, text="Sheet not found")
+        return None, "Sheet not found"
     
     # Find the best sheet file (highest index)
     pattern = os.path.join(sheet_dir, "sheet_neutral_*.png")
@@ -304,71 +553,208 @@ async def get_character_preview(request):
         files = glob.glob(os.path.join(sheet_dir, "*.png"))
     
     if not files:
-        return web.Response(status=404, text="No sheet images found")
+        return None, "No sheet images found"
     
-    def get_index(f):
-        m = re.search(r'(\d+)', os.path.basename(f))
-        return int(m.group(1)) if m else 0
+    # Highest index wins; a lone sheet needs no regex at all
+    return (files[0] if len(files) == 1 else max(files, key=_sheet_idx)), None
+
+# VNCCS-style character sheet preview
+@PromptServer.instance.routes.get("/umiapp/character/preview")
+async def get_character_preview(request):
+    """Get cropped preview from character sheet (VNCCS-compatible)."""
+    character = request.query.get("character", "")
+    if not character:
+        return web.Response(status=404, text="No character specified")
     
-    files.sort(key=get_index)
-    best_file = files[-1]
+    chars_path = _resolve_umi_asset_path("characters", character)
+    
+    # Directory probes and globbing stay off the event loop too
+    loop = asyncio.get_running_loop()
+    best_file, missing = await loop.run_in_executor(None, _find_sheet_file, chars_path)
+    if best_file is None:
+        return web.Response(status=404, text=missing)
     
-    # Crop: Sheet is 6x2 grid, get last cell (row 1, col 5)
     try:
-        img = Image.open(best_file)
-        w, h = img.size
-        item_w = w // 6
-        item_h = h // 2
-        
-        row, col = 1, 5
-        left = col * item_w
-        upper = row * item_h
-        right = left + item_w
-        lower = upper + item_h
-        
-        crop = img.crop((left, upper, right, lower))
-        
-        img_byte_arr = io.BytesIO()
-        crop.save(img_byte_arr, format='PNG')
-        return web.Response(body=img_byte_arr.getvalue(), content_type='image/png')
+        cache_path, body = await loop.run_in_executor(None, _sheet_preview, chars_path, best_file)
+        if cache_path:
+            return web.FileResponse(cache_path)
+        return web.Response(body=body, content_type='image/png')
     except Exception as e:
         return web.Response(status=500, text=str(e))
 
+def _read_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+# Serialized emotions.json response body, keyed by (path, mtime_ns, size)
+_EMO_CACHE = {'key': None, 'body': None}
+
+def _emotions_body(config_path, st):
+    key = (config_path, st.st_mtime_ns, st.st_size)
+    if _EMO_CACHE['key'] != key:
+        if orjson is not None:
+            with open(config_path, 'rb') as f:
+                body = orjson.dumps(orjson.loads(f.read()))
+        else:
+            body = json.dumps(_read_json(config_path)).encode('utf-8')
+        _EMO_CACHE['body'] = body
+        _EMO_CACHE['key'] = key
+    return _EMO_CACHE['body']
+
 # VNCCS-style emotions API
 @PromptServer.instance.routes.get("/umiapp/emotions")
 async def get_emotions(request):
     """Get emotions config data (VNCCS-compatible)."""
     config_path = _resolve_umi_asset_path("emotions-config", "emotions.json")
     
-    if not os.path.exists(config_path):
+    try:
+        st = os.stat(config_path)
+    except OSError:
         return web.json_response({"error": "emotions.json not found"}, status=404)
     
-    import json
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        return web.json_response(data)
+        if _EMO_CACHE['key'] == (config_path, st.st_mtime_ns, st.st_size):
+            body = _EMO_CACHE['body']
+        else:
+            loop = asyncio.get_running_loop()
+            body = await loop.run_in_executor(None, _emotions_body, config_path, st)
+        return web.Response(body=body, content_type='application/json')
     except Exception as e:
         return web.json_response({"error": str(e)}, status=500)
 
+# Emotion safe_names may hold any character except path separators (/, \ and the Windows drive colon) and NUL;
+# ".." anywhere and a leading dot are rejected too
+_EMOTION_NAME_RE = re.compile(r'\A(?!\.)(?!.*\.\.)[^/\\:\x00]+\Z', re.DOTALL)
+
 # Emotion image server
 @PromptServer.instance.routes.get("/umiapp/emotion/image")
 async def get_emotion_image(request):
     """Serve emotion image by safe_name."""
     from urllib.parse import unquote
     
-    name = request.query.get("name", "")
-    if not name or ".." in name or "/" in name or "\\" in name:
+    # Validate after decoding so an encoded separator can't slip through
+    name = unquote(request.query.get("name", "")).strip()
+    if not _EMOTION_NAME_RE.match(name):
         return web.Response(status=400)
     
-    name = unquote(name).strip()
     image_path = _resolve_umi_asset_path("emotions-config", "images", f"{name}.png")
     
-    if not os.path.exists(image_path):
+    if not os.path.isfile(image_path):
         return web.Response(status=404)
     
-    return web.FileResponse(image_path)
+    # FileResponse sets ETag/Last-Modified and answers If-None-Match with 304; let browsers reuse it for an hour
+    return web.FileResponse(image_path, headers={'Cache-Control': 'public, max-age=3600'})
+
+
+def _preview_txt_lines(f, limit=15, chunk_size=8192):
+    """First `limit` lines of a txt wildcard, served from one small read when possible."""
+    chunk = f.read(chunk_size)
+    raw = chunk.split('\n')
+    if len(chunk) < chunk_size:
+        # Whole file fits in the buffer
+        if raw[-1] == '':
+            raw.pop()
+        line_iter = iter(raw)
+    elif len(raw) > limit + 1:
+        # Every line we look at is complete; a partial tail only marks "more"
+        line_iter = iter(raw)
+    else:
+        # Long lines: finish the partial one and stream the rest
+        tail = raw.pop() + f.readline()
+        line_iter = itertools.chain(raw, [tail] if tail else [], f)
+
+    lines = []
+    for i, line in enumerate(line_iter):
+        if i >= limit:
+            lines.append("... (more entries)")
+            break
+        line = line.strip()
+        if line and not line.startswith('#'):
+            # Strip tags (:: separator) for preview
+            if '::' in line:
+                line = line.split('::')[0]
+            lines.append(line)
+    return lines
+
+# Larger YAMLs that need a full load for a preview get a regex scrape of their head instead
+_PREVIEW_FULL_LOAD_MAX = 64 * 1024
+_PREVIEW_HEAD_CHARS = 32 * 1024
+_TOP_LEVEL_KEY_RE = re.compile(r'^([A-Za-z_][\w\- ]*?)[ \t]*:(?:[ \t]|$)', re.M)
+
+def _preview_yaml_keys(f, limit=15):
+    """First `limit` top-level keys of a YAML wildcard, parsing only as far as needed."""
+    keys = {}
+    try:
+        events = yaml.parse(f, Loader=_YamlLoader)
+        next(events)  # StreamStart
+        if isinstance(next(events), yaml.DocumentStartEvent) and isinstance(next(events), yaml.MappingStartEvent):
+            while True:
+                key = next(events)
+                if isinstance(key, yaml.MappingEndEvent):
+                    return list(keys)
+                if not isinstance(key, yaml.ScalarEvent) or key.value == '<<':
+                    raise _NeedFullParse
+                if len(keys) == limit:
+                    return list(keys) + ["... (more entries)"]
+                keys[_scalar_text(key)] = None
+                value = next(events)
+                if isinstance(value, yaml.AliasEvent):
+                    continue
+                _skip_node(events, value)
+        return []
+    except Exception:
+        pass
+
+    # Merge keys, complex keys or parse errors: defer to a full load, but only for small files
+    f.seek(0)
+    if os.fstat(f.fileno()).st_size > _PREVIEW_FULL_LOAD_MAX:
+        head = f.read(_PREVIEW_HEAD_CHARS)
+        truncated = bool(f.read(1))
+        if truncated:
+            # Drop the cut-off last line
+            head = head[:head.rfind('\n') + 1]
+        keys = list(dict.fromkeys(m.group(1) for m in _TOP_LEVEL_KEY_RE.finditer(head)))
+        if truncated or len(keys) > limit:
+            return keys[:limit] + ["... (more entries)"]
+        return keys
+    data = yaml.load(f, Loader=_YamlLoader)
+    if not isinstance(data, dict):
+        return []
+    entries = list(data.keys())[:limit]
+    if len(data) > limit:
+        entries.append(f"... (+{len(data) - limit} more)")
+    return entries
+
+def _preview_wildcard(filename):
+    """Find a wildcard file by name and build its preview payload. Returns (payload, status)."""
+    wildcards_path = os.path.join(os.path.dirname(__file__), "wildcards")
 
+    # Index from the last tree scan; open it straight away, a file that has gone since just falls through
+    indexed = (_WC_CACHE['paths'] or {}).get(filename.lower())
+    if indexed:
+        try:
+            return _preview_payload(indexed, filename), 200
+        except (FileNotFoundError, IsADirectoryError):
+            pass
+        except Exception as e:
+            return {"error": str(e)}, 500
+    
+    # Try every direct path before walking the tree
+    for ext in ['txt', 'yaml', 'yml', 'csv']:
+        file_path = os.path.join(wildcards_path, f"{filename}.{ext}")
+        try:
+            return _preview_payload(file_path, filename), 200
+        except FileNotFoundError:
+            continue
+        except Exception as e:
+            return {"error": str(e)}, 500
+    
+    # Fall back to a single recursive search
+    found = _find_wildcard_file(wildcards_path, filename)
+    if found:
+        return _preview_wildcard_file(found, filename)
+    
+    return {"file": filename, "entries": [], "error": "File not found"}, 200
 
 @PromptServer.instance.routes.get("/umiapp/preview")
 async def preview_wildcard(request):
@@ -377,125 +763,82 @@ async def preview_wildcard(request):
     if not filename:
         return web.json_response({"error": "No file specified"}, status=400)
     
-    wildcards_path = os.path.join(os.path.dirname(__file__), "wildcards")
-    entries = []
-    
-    # Search for the file
-    for ext in ['txt', 'yaml', 'yml', 'csv']:
-        # Try direct path
-        file_path = os.path.join(wildcards_path, f"{filename}.{ext}")
-        if os.path.exists(file_path):
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    if ext == 'txt':
-                        # Read first 15 lines
-                        lines = []
-                        for i, line in enumerate(f):
-                            if i >= 15:
-                                lines.append("... (more entries)")
-                                break
-                            line = line.strip()
-                            if line and not line.startswith('#'):
-                                # Strip tags (:: separator) for preview
-                                if '::' in line:
-                                    line = line.split('::')[0]
-                                lines.append(line)
-                        entries = lines
-                    elif ext in ['yaml', 'yml']:
-                        data = yaml.safe_load(f)
-                        if isinstance(data, dict):
-                            entries = list(data.keys())[:15]
-                            if len(data) > 15:
-                                entries.append(f"... (+{len(data) - 15} more)")
-                    elif ext == 'csv':
-                        import csv as csv_module
-                        reader = csv_module.reader(f)
-                        for i, row in enumerate(reader):
-                            if i >= 15:
-                                entries.append("... (more entries)")
-                                break
-                            if row:
-                                entries.append(row[0])
-                return web.json_response({
-                    "file": filename,
-                    "type": ext,
-                    "entries": entries,
-                    "count": len(entries)
-                })
-            except Exception as e:
-                return web.json_response({"error": str(e)}, status=500)
-        
-        # Try recursive search
-        for root, dirs, files in os.walk(wildcards_path):
-            for f in files:
-                name_without_ext = os.path.splitext(f)[0]
-                rel_path = os.path.relpath(os.path.join(root, f), wildcards_path)
-                rel_name = os.path.splitext(rel_path)[0].replace(os.sep, '/')
-                if rel_name.lower() == filename.lower() or name_without_ext.lower() == filename.lower():
-                    return await preview_wildcard_file(os.path.join(root, f), filename)
-    
-    return web.json_response({"file": filename, "entries": [], "error": "File not found"})
+    loop = asyncio.get_running_loop()
+    payload, status = await loop.run_in_executor(None, _preview_wildcard, filename)
+    return _json_response(payload, status=status)
+
+def _find_wildcard_file(wildcards_path, filename):
+    """Return the first file whose relative name or basename matches filename."""
+    wanted = filename.lower()
+    prefix_len = len(wildcards_path) + 1
+    for entry in _iter_wildcard_files(wildcards_path):
+        name_without_ext = os.path.splitext(entry.name)[0]
+        rel_name = os.path.splitext(entry.path[prefix_len:])[0].replace(os.sep, '/')
+        if rel_name.lower() == wanted or name_without_ext.lower() == wanted:
+            return entry.path
+    return None
 
-async def preview_wildcard_file(file_path, filename):
-    """Helper to preview a specific wildcard file."""
+def _preview_payload(file_path, filename):
+    """Preview payload for one wildcard file; raises if it can't be opened or parsed."""
     entries = []
     ext = os.path.splitext(file_path)[1].lower()[1:]
-    
+    with open(file_path, 'r', encoding='utf-8') as f:
+        if ext == 'txt':
+            # Read first 15 lines
+            entries = _preview_txt_lines(f)
+        elif ext in ['yaml', 'yml']:
+            entries = _preview_yaml_keys(f)
+        elif ext == 'csv':
+            import csv as csv_module
+            reader = csv_module.reader(f)
+            for i, row in enumerate(reader):
+                if i >= 15:
+                    entries.append("... (more entries)")
+                    break
+                if row:
+                    entries.append(row[0])
+    return {
+        "file": filename,
+        "type": ext,
+        "entries": entries,
+        "count": len(entries)
+    }
+
+def _preview_wildcard_file(file_path, filename):
+    """Helper to preview a specific wildcard file. Returns (payload, status)."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            if ext == 'txt':
-                lines = []
-                for i, line in enumerate(f):
-                    if i >= 15:
-                        lines.append("... (more entries)")
-                        break
-                    line = line.strip()
-                    if line and not line.startswith('#'):
-                        # Strip tags (:: separator) for preview
-                        if '::' in line:
-                            line = line.split('::')[0]
-                        lines.append(line)
-                entries = lines
-            elif ext in ['yaml', 'yml']:
-                data = yaml.safe_load(f)
-                if isinstance(data, dict):
-                    entries = list(data.keys())[:15]
-                    if len(data) > 15:
-                        entries.append(f"... (+{len(data) - 15} more)")
-        return web.json_response({
-            "file": filename,
-            "type": ext,
-            "entries": entries,
-            "count": len(entries)
-        })
+        return _preview_payload(file_path, filename), 200
     except Exception as e:
-        return web.json_response({"error": str(e)}, status=500)
+        return {"error": str(e)}, 500
 
 @PromptServer.instance.routes.post("/umiapp/refresh")
 async def refresh_wildcards(request):
-    # Trigger a cache clear for BOTH full and lite nodes
-    from .nodes import GLOBAL_CACHE, GLOBAL_INDEX, FILE_MTIME_CACHE
+    # Trigger a cache refresh for BOTH full and lite nodes
+    from .nodes import invalidate_changed_wildcards
     from .nodes_lite import GLOBAL_CACHE_LITE, GLOBAL_INDEX_LITE, FILE_MTIME_CACHE_LITE
+    from .shared_utils import drop_stale_cache_entries
 
-    # Clear full node cache (including mtime cache)
-    GLOBAL_CACHE.clear()
-    GLOBAL_INDEX['built'] = False
-    GLOBAL_INDEX['files'] = set()
-    GLOBAL_INDEX['entries'] = {}
-    GLOBAL_INDEX['tags'] = set()
-    FILE_MTIME_CACHE.clear()  # Fix 12: Clear modification time cache on refresh
+    def drop_stale():
+        # Full node: drop only changed files; the index rebuild reuses unchanged YAML parses
+        invalidate_changed_wildcards()
+        # Lite node: drop changed files (one stat each)
+        drop_stale_cache_entries(GLOBAL_CACHE_LITE, FILE_MTIME_CACHE_LITE)
 
-    # Clear lite node cache (including mtime cache)
-    GLOBAL_CACHE_LITE.clear()
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, drop_stale)
+
+    # Lite node: rebuild its index
     GLOBAL_INDEX_LITE['built'] = False
     GLOBAL_INDEX_LITE['files'] = set()
     GLOBAL_INDEX_LITE['entries'] = {}
     GLOBAL_INDEX_LITE['tags'] = set()
-    FILE_MTIME_CACHE_LITE.clear()  # Fix 12: Clear modification time cache on refresh
+
+    # Force a rescan of the wildcard tree
+    _WC_CACHE['sig'] = None
 
     # Return fresh data
-    data = get_wildcard_data()
-    return web.json_response({
+    data = await loop.run_in_executor(None, get_wildcard_data)
+    return _json_response({
         "status": "success",
         "count": len(data.get("files", [])) + len(data.get("tags", [])),
         **data
@@ -508,58 +851,119 @@ async def refresh_wildcards(request):
 import json
 import asyncio
 import threading
+import time
 import traceback
 import requests
 import queue
-import urllib.parse
-
-try:
-    from huggingface_hub import hf_hub_download, hf_hub_url
-    HF_HUB_AVAILABLE = True
-except Exception:
-    HF_HUB_AVAILABLE = False
-
-# Universal download queue to avoid contention
-download_queue = queue.Queue()
-download_status = {}
+from collections import OrderedDict
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.exceptions import ProtocolError, ReadTimeoutError, DecodeError, SSLError
+
+# huggingface_hub is slow to import; only probe for it here and import on first download
+HF_HUB_AVAILABLE = importlib.util.find_spec("huggingface_hub") is not None
+
+# One pooled session so sequential files and queued jobs reuse TCP/TLS connections
+_HTTP_RETRY = Retry(total=3, backoff_factor=0.3, status_forcelist=(500, 502, 503, 504), raise_on_status=False)
+_HTTP = requests.Session()
+_HTTP.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=_HTTP_RETRY))
+_HTTP.mount("http://", HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=_HTTP_RETRY))
+_HTTP_TIMEOUT = (10, 60)
+
+# Universal download queue to avoid contention.
+# Items are (priority, seq, repo_id, model_name, target_model, attempt); lower priority runs first.
+download_queue = queue.PriorityQueue()
+_queue_seq = itertools.count()
+_MAX_DOWNLOAD_ATTEMPTS = 3
+# Oldest first; finished entries beyond _MAX_STATUS_ENTRIES are dropped
+download_status = OrderedDict()
+_MAX_STATUS_ENTRIES = 256
+_TERMINAL_STATUSES = ("success", "error", "auth_required")
+# Guards _in_flight and queue-time status writes; (repo_id, model_name) queued or downloading
+_status_lock = threading.Lock()
+_in_flight = set()
+
+# Status change counter, the loop serving /umiapp/models/events, and its pending waiters
+_status_state = {'version': 0, 'loop': None}
+_status_waiters = set()
+_status_snapshot = {'version': -1, 'body': None}
+
+def _wake_status_waiters():
+    for waiter in _status_waiters:
+        if not waiter.done():
+            waiter.set_result(None)
+    _status_waiters.clear()
+
+def _publish_status():
+    """Record a download_status change and wake any event-stream clients."""
+    with _status_lock:
+        _status_state['version'] += 1
+    loop = _status_state['loop']
+    if loop is not None:
+        try:
+            loop.call_soon_threadsafe(_wake_status_waiters)
+        except RuntimeError:
+            pass
+
+def _store_status(model_name, value):
+    # Caller holds _status_lock
+    download_status[model_name] = value
+    download_status.move_to_end(model_name)
+    excess = len(download_status) - _MAX_STATUS_ENTRIES
+    if excess > 0:
+        stale = [name for name, entry in download_status.items()
+                 if name != model_name and entry.get("status") in _TERMINAL_STATUSES]
+        for name in stale[:excess]:
+            del download_status[name]
+
+def _status_copy():
+    # Workers add/evict entries concurrently; serialize a copy, not the live dict
+    with _status_lock:
+        return {name: dict(entry) for name, entry in download_status.items()}
+
+def _set_status(model_name, value):
+    with _status_lock:
+        _store_status(model_name, value)
+    _publish_status()
 
 def resolve_path(relative_path):
     base = getattr(folder_paths, "base_path", os.getcwd())
     return os.path.abspath(os.path.join(base, relative_path))
 
+# In-memory copies of the small JSON files under base_path; writes go through to disk atomically
+_json_mirrors = {}
+_json_mirror_lock = threading.Lock()
+
+def _mirror_load(filename):
+    data = _json_mirrors.get(filename)
+    if data is None:
+        data = _read_json_file(resolve_path(filename), {})
+        if not isinstance(data, dict):
+            data = {}
+        _json_mirrors[filename] = data
+    return data
+
+def _mirror_get(filename):
+    with _json_mirror_lock:
+        return dict(_mirror_load(filename))
+
+def _mirror_update(filename, new_data):
+    with _json_mirror_lock:
+        data = {**_mirror_load(filename), **new_data}
+        _atomic_write_json(resolve_path(filename), data, indent=2)
+        _json_mirrors[filename] = data
+
 def get_installed_version_info():
-    registry_path = resolve_path("umi_installed_models.json")
-    if os.path.exists(registry_path):
-        try:
-            with open(registry_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception:
-            return {}
-    return {}
+    return _mirror_get("umi_installed_models.json")
 
 def update_installed_version(model_name, version):
-    registry_path = resolve_path("umi_installed_models.json")
-    data = get_installed_version_info()
-    data[model_name] = version
-    with open(registry_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2)
+    _mirror_update("umi_installed_models.json", {model_name: version})
 
 def get_umi_config():
-    config_path = resolve_path("umi_user_config.json")
-    if os.path.exists(config_path):
-        try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception:
-            return {}
-    return {}
+    return _mirror_get("umi_user_config.json")
 
 def save_umi_config(new_data):
-    config_path = resolve_path("umi_user_config.json")
-    data = get_umi_config()
-    data.update(new_data)
-    with open(config_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2)
+    _mirror_update("umi_user_config.json", new_data)
 
 def _convert_manifest_to_config(manifest):
     version = str(manifest.get("version", "1.0"))
@@ -597,29 +1001,292 @@ def _convert_manifest_to_config(manifest):
     return {"models": models}
 
 
-def _fetch_model_config(repo_id):
-    if not HF_HUB_AVAILABLE:
-        raise RuntimeError("huggingface_hub is not installed.")
+# repo_id -> (fetched_at, config); the UI re-checks often and the manifest rarely changes
+_CONFIG_TTL = 60
+_config_cache = {}
+_config_cache_lock = threading.Lock()
+
+def _fetch_model_config(repo_id, force_refresh=False):
+    if not force_refresh:
+        with _config_cache_lock:
+            hit = _config_cache.get(repo_id)
+        if hit and time.monotonic() - hit[0] < _CONFIG_TTL:
+            return hit[1]
+
+    config = _load_model_config(repo_id)
+    with _config_cache_lock:
+        _config_cache[repo_id] = (time.monotonic(), config)
+    return config
+
+
+def _hf_auth_headers():
+    token = os.environ.get("HF_TOKEN")
+    if not token:
+        try:
+            from huggingface_hub import get_token
+            token = get_token()
+        except Exception:
+            token = None
+    return {"Authorization": f"Bearer {token}"} if token else {}
+
+
+def _fetch_repo_json(repo_id, filename):
+    """Read a small JSON file straight from the Hub, skipping the HF cache dir; uses the cache when offline."""
+    from huggingface_hub import hf_hub_url
 
     try:
-        path = hf_hub_download(repo_id=repo_id, filename="model_updater.json", local_files_only=False)
+        response = _HTTP.get(hf_hub_url(repo_id, filename), headers=_hf_auth_headers(), timeout=(10, 30))
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+        from huggingface_hub import hf_hub_download
+        path = hf_hub_download(repo_id=repo_id, filename=filename, local_files_only=True)
         with open(path, 'r', encoding='utf-8') as f:
             return json.load(f)
+    response.raise_for_status()
+    return orjson.loads(response.content) if orjson is not None else response.json()
+
+
+def _load_model_config(repo_id):
+    if not HF_HUB_AVAILABLE:
+        raise RuntimeError("huggingface_hub is not installed.")
+
+    try:
+        return _fetch_repo_json(repo_id, "model_updater.json")
     except Exception:
-        path = hf_hub_download(repo_id=repo_id, filename="models_manifest.json", local_files_only=False)
-        with open(path, 'r', encoding='utf-8') as f:
-            manifest = json.load(f)
+        manifest = _fetch_repo_json(repo_id, "models_manifest.json")
         return _convert_manifest_to_config(manifest)
 
 
+# Civitai web link (civitai.com/models/<id>?...modelVersionId=<ver>) -> version id
+_CIVITAI_VERSION_RE = re.compile(r"civitai\.com/models/[^?#]*\?(?:[^#]*?&)??modelVersionId=([^&#]+)")
+
+_DOWNLOAD_CHUNK = 4 * 1024 * 1024
+
+def _iter_raw(raw):
+    """Read raw in _DOWNLOAD_CHUNK blocks, raising the requests exceptions iter_content would."""
+    try:
+        yield from iter(functools.partial(raw.read, _DOWNLOAD_CHUNK), b'')
+    except ProtocolError as e:
+        raise requests.exceptions.ChunkedEncodingError(e)
+    except DecodeError as e:
+        raise requests.exceptions.ContentDecodingError(e)
+    except ReadTimeoutError as e:
+        raise requests.exceptions.ConnectionError(e)
+    except SSLError as e:
+        raise requests.exceptions.SSLError(e)
+
+def _iter_body(response):
+    """Yield a streamed response body in _DOWNLOAD_CHUNK pieces."""
+    raw = response.raw
+    if getattr(raw, 'chunked', False) and not response.headers.get('content-encoding'):
+        # iter_content yields one piece per HTTP chunk (often a few KiB) on chunked
+        # transfers; reading the raw response lets http.client join them into full blocks
+        return _iter_raw(raw)
+    return response.iter_content(chunk_size=_DOWNLOAD_CHUNK)
+
+# Up to 16 MiB of read-ahead per download
+_WRITE_QUEUE_DEPTH = 4
+
+def _pipelined_write(chunks, f, on_progress, written=0):
+    """Write chunks to f from a separate thread so disk latency doesn't stall network reads.
+
+    Returns the byte count (starting from written). On failure f is truncated to what was written.
+    """
+    pending = queue.Queue(maxsize=_WRITE_QUEUE_DEPTH)
+    state = {"written": written, "error": None}
+
+    def writer():
+        try:
+            while True:
+                chunk = pending.get()
+                if chunk is None:
+                    return
+                f.write(chunk)
+                state["written"] += len(chunk)
+                on_progress(state["written"])
+        except BaseException as e:
+            state["error"] = e
+            # Keep draining so the reader never blocks on a full queue
+            while pending.get() is not None:
+                pass
+
+    thread = threading.Thread(target=writer, daemon=True)
+    thread.start()
+    try:
+        try:
+            for chunk in chunks:
+                if state["error"] is not None:
+                    break
+                if chunk:
+                    pending.put(chunk)
+        finally:
+            pending.put(None)
+            thread.join()
+        if state["error"] is not None:
+            raise state["error"]
+    except BaseException:
+        # Drop the preallocated tail so a retry can resume from what arrived
+        f.flush()
+        f.truncate(state["written"])
+        raise
+    return state["written"]
+
+# Large files are fetched as parallel byte ranges when the server supports it
+_RANGED_MIN_SIZE = 64 * 1024 * 1024
+_RANGED_SEGMENTS = 4
+
+def _preallocate(f, size):
+    """Reserve size bytes for f up front so large files aren't grown chunk by chunk."""
+    try:
+        os.posix_fallocate(f.fileno(), 0, size)
+    except (AttributeError, OSError):
+        # Windows/macOS, or a filesystem without fallocate
+        f.truncate(size)
+    f.seek(0)
+
+def _ranged_download(url, headers, total_size, dest_path, on_progress, segments=_RANGED_SEGMENTS):
+    """Download url into dest_path as parallel Range requests. Returns False if a range was refused."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    with open(dest_path, 'wb') as f:
+        _preallocate(f, total_size)
+
+    seg_size = -(-total_size // segments)
+    bounds = [(start, min(start + seg_size, total_size) - 1) for start in range(0, total_size, seg_size)]
+    # Per-segment byte counts, each written by one thread only; progress is their sum
+    seg_written = [0] * len(bounds)
+
+    def fetch(index, start, end):
+        response = _HTTP.get(url, headers={**headers, "Range": f"bytes={start}-{end}"},
+                             stream=True, allow_redirects=True, timeout=_HTTP_TIMEOUT)
+        with response:
+            response.raise_for_status()
+            if response.status_code != 206:
+                return False
+            written = 0
+            with open(dest_path, 'r+b') as f:
+                f.seek(start)
+                for chunk in _iter_body(response):
+                    if chunk:
+                        f.write(chunk)
+                        written += len(chunk)
+                        seg_written[index] = written
+                        on_progress(sum(seg_written))
+                f.flush()
+                os.fsync(f.fileno())
+            if written != end - start + 1:
+                raise _IncompleteDownload(f"Incomplete range {start}-{end}: got {written} bytes")
+        return True
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(bounds)) as pool:
+            results = list(pool.map(lambda ib: fetch(ib[0], *ib[1]), enumerate(bounds)))
+    except BaseException:
+        # Only the first segment is a contiguous prefix; keep it for a resumed retry
+        with open(dest_path, 'r+b') as f:
+            f.truncate(seg_written[0])
+        raise
+    return all(results)
+
+
+def _partial_candidates(target_abs_path, model_name, index):
+    sanitized_name = "".join(x for x in model_name if x.isalnum())
+    return (f"{target_abs_path}.umi-part",
+            os.path.join(folder_paths.base_path, "temp", f"umi_{sanitized_name}_{index + 1}.tmp"))
+
+
+def _partial_path(target_abs_path, model_name, index):
+    """Temp file next to the target so installing is a rename; ComfyUI's temp dir if that isn't writable."""
+    beside_target, in_temp = _partial_candidates(target_abs_path, model_name, index)
+    target_dir = os.path.dirname(target_abs_path)
+    try:
+        os.makedirs(target_dir, exist_ok=True)
+        if os.access(target_dir, os.W_OK):
+            return beside_target
+    except OSError:
+        pass
+
+    os.makedirs(os.path.dirname(in_temp), exist_ok=True)
+    return in_temp
+
+
+def _partial_meta_path(partial_path):
+    # Version and ETag of the download a partial file belongs to
+    return f"{partial_path}.json"
+
+
+def _remove_partial(partial_path):
+    for path in (partial_path, _partial_meta_path(partial_path)):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _find_partial(target_abs_path, model_name, index, version):
+    """(path, size, etag) of a non-empty partial download of this version, or (None, 0, "").
+
+    Partials without metadata or left by another version are deleted rather than resumed.
+    """
+    for path in _partial_candidates(target_abs_path, model_name, index):
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            continue
+        if size <= 0:
+            continue
+        meta = _read_json_file(_partial_meta_path(path), None)
+        if not isinstance(meta, dict) or meta.get("version") != version:
+            _remove_partial(path)
+            continue
+        return path, size, meta.get("etag") or ""
+    return None, 0, ""
+
+
+def _drop_page_cache(path):
+    """Let the kernel evict a finished download from the page cache (no-op where unsupported)."""
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
+
+class _IncompleteDownload(IOError):
+    pass
+
+
+def _download_priority(target_model):
+    # Models with fewer files first, so small downloads aren't stuck behind multi-file checkpoints
+    return len(target_model.get("files") or ()) or 1
+
+
+def _enqueue_download(repo_id, model_name, target_model, priority=None, attempt=0):
+    if priority is None:
+        priority = _download_priority(target_model)
+    download_queue.put((priority, next(_queue_seq), repo_id, model_name, target_model, attempt))
+
+
+def _is_transient_error(e):
+    if isinstance(e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                      requests.exceptions.ChunkedEncodingError, _IncompleteDownload)):
+        return True
+    if isinstance(e, requests.exceptions.HTTPError) and e.response is not None:
+        return e.response.status_code == 429 or e.response.status_code >= 500
+    return False
+
+
 def worker_loop():
     while True:
-        task = download_queue.get()
-        if task is None:
+        priority, _seq, repo_id, model_name, target_model, attempt = download_queue.get()
+        if repo_id is None:
             break
 
-        repo_id, model_name, target_model = task
-
+        retrying = False
         try:
             file_entries = target_model.get("files") or []
             if not file_entries:
@@ -631,9 +1298,15 @@ def worker_loop():
                     "hf_path": target_model.get("hf_path", "")
                 }]
 
+            # Tokens are read once per model, not once per file
+            civitai_token = get_umi_config().get("civitai_token", "")
+            hf_token = os.environ.get("HF_TOKEN")
+            target_version = target_model.get("version", "")
+
             for index, file_entry in enumerate(file_entries):
                 file_name = file_entry.get("filename") or os.path.basename(file_entry.get("local_path", "")) or "file"
-                download_status[model_name] = {
+                # One status dict per file; progress updates mutate it in place
+                slot = {
                     "status": "downloading",
                     "message": f"Downloading {file_name}...",
                     "progress": 0,
@@ -641,6 +1314,7 @@ def worker_loop():
                     "file_index": index + 1,
                     "file_count": len(file_entries)
                 }
+                _set_status(model_name, slot)
 
                 url = ""
                 headers = {}
@@ -649,87 +1323,126 @@ def worker_loop():
                 if file_entry.get("url") or target_model.get("url"):
                     url = file_entry.get("url") or target_model.get("url", "")
 
-                    if "civitai.com/models/" in url and "api/download" not in url:
-                        parsed = urllib.parse.urlparse(url)
-                        qs = urllib.parse.parse_qs(parsed.query)
-                        if "modelVersionId" in qs:
-                            ver_id = qs["modelVersionId"][0]
-                            url = f"https://civitai.com/api/download/models/{ver_id}"
-                            print(f"[UmiAI] Auto-converted Civitai Web Link to API: {url}")
-
-                    if "civitai.com" in url:
-                        user_config = get_umi_config()
-                        civitai_token = user_config.get("civitai_token", "")
-                        if civitai_token:
-                            headers = {"Authorization": f"Bearer {civitai_token}"}
+                    m = _CIVITAI_VERSION_RE.search(url)
+                    if m and "api/download" not in url:
+                        url = f"https://civitai.com/api/download/models/{m.group(1)}"
+                        print(f"[UmiAI] Auto-converted Civitai Web Link to API: {url}")
+
+                    if "civitai.com" in url and civitai_token:
+                        headers = {"Authorization": f"Bearer {civitai_token}"}
                 else:
                     if not HF_HUB_AVAILABLE:
                         raise RuntimeError("huggingface_hub is not installed.")
+                    from huggingface_hub import hf_hub_url
 
                     filename = file_entry.get("hf_path") or target_model.get("hf_path", "")
                     if filename.startswith(f"{file_repo_id}/"):
                         filename = filename[len(file_repo_id) + 1:]
                     url = hf_hub_url(file_repo_id, filename)
-                    token = os.environ.get("HF_TOKEN")
-                    if token:
-                        headers = {"Authorization": f"Bearer {token}"}
-
-                response = requests.get(url, headers=headers, stream=True, allow_redirects=True)
-                response.raise_for_status()
+                    if hf_token:
+                        headers = {"Authorization": f"Bearer {hf_token}"}
 
-                total_size = int(response.headers.get('content-length', 0))
-                downloaded = 0
-
-                temp_dir = os.path.join(folder_paths.base_path, "temp")
-                os.makedirs(temp_dir, exist_ok=True)
-                sanitized_name = "".join(x for x in model_name if x.isalnum())
-                temp_filename = f"umi_{sanitized_name}_{index + 1}.tmp"
-                temp_path = os.path.join(temp_dir, temp_filename)
-
-                with open(temp_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
-                            downloaded += len(chunk)
-                            if total_size > 0:
-                                percent = (downloaded / total_size) * 100
-                                mb_done = downloaded / (1024 * 1024)
-                                mb_total = total_size / (1024 * 1024)
-                                msg = f"{file_name}: {mb_done:.1f}/{mb_total:.1f} MB"
-                                download_status[model_name] = {
-                                    "status": "downloading",
-                                    "message": msg,
-                                    "progress": percent,
-                                    "file": file_name,
-                                    "file_index": index + 1,
-                                    "file_count": len(file_entries)
-                                }
-                            else:
-                                mb_done = downloaded / (1024 * 1024)
-                                download_status[model_name] = {
-                                    "status": "downloading",
-                                    "message": f"{file_name}: {mb_done:.1f} MB",
-                                    "progress": 0,
-                                    "file": file_name,
-                                    "file_index": index + 1,
-                                    "file_count": len(file_entries)
-                                }
-
-                download_status[model_name]["message"] = f"Installing {file_name}..."
                 target_rel_path = file_entry.get("local_path") or target_model.get("local_path", "")
                 if not target_rel_path:
                     raise RuntimeError(f"Missing local_path for {model_name}")
 
                 target_abs_path = resolve_path(target_rel_path)
                 target_dir = os.path.dirname(target_abs_path)
-                os.makedirs(target_dir, exist_ok=True)
 
-                import shutil
-                shutil.move(temp_path, target_abs_path)
+                # Resume a partial file from an earlier attempt when the server honours Range
+                partial_path, existing, partial_etag = _find_partial(target_abs_path, model_name, index, target_version)
+                request_headers = headers
+                if existing:
+                    request_headers = {**headers, "Range": f"bytes={existing}-"}
+                    # If-Range makes the server send the whole new file instead of a range of it if it changed
+                    if partial_etag and not partial_etag.startswith("W/"):
+                        request_headers["If-Range"] = partial_etag
+                response = _HTTP.get(url, headers=request_headers, stream=True, allow_redirects=True, timeout=_HTTP_TIMEOUT)
+                resumed = (existing > 0 and response.status_code == 206
+                           and response.headers.get('content-range', '').startswith(f"bytes {existing}-")
+                           and int(response.headers.get('content-length', 0)) > 0
+                           and not response.headers.get('content-encoding')
+                           and (not partial_etag or response.headers.get('etag') == partial_etag))
+                if existing and not resumed:
+                    # Range ignored, not satisfiable (e.g. a preallocated leftover) or the file changed: start over
+                    response.close()
+                    _remove_partial(partial_path)
+                    existing = 0
+                    response = _HTTP.get(url, headers=headers, stream=True, allow_redirects=True, timeout=_HTTP_TIMEOUT)
+                response.raise_for_status()
+
+                content_length = int(response.headers.get('content-length', 0))
+                total_size = existing + content_length if content_length else 0
+
+                if resumed:
+                    temp_path = partial_path
+                else:
+                    temp_path = _partial_path(target_abs_path, model_name, index)
+                    _atomic_write_json(_partial_meta_path(temp_path),
+                                       {"version": target_version, "etag": response.headers.get('etag', '')})
+
+                # Publish when the whole percent changes or every half second, at most 10 times a second
+                last_publish = [-1, 0.0]
+
+                def report(downloaded, file_name=file_name, total_size=total_size, last=last_publish, slot=slot):
+                    now = time.monotonic()
+                    if now - last[1] < 0.1 and downloaded != total_size:
+                        return
+                    if total_size > 0:
+                        percent = (downloaded / total_size) * 100
+                        if int(percent) == last[0] and now - last[1] < 0.5:
+                            return
+                        last[0], last[1] = int(percent), now
+                        mb_done = downloaded / (1024 * 1024)
+                        mb_total = total_size / (1024 * 1024)
+                        slot["message"] = f"{file_name}: {mb_done:.1f}/{mb_total:.1f} MB"
+                        slot["progress"] = percent
+                    else:
+                        if now - last[1] < 0.5:
+                            return
+                        last[1] = now
+                        mb_done = downloaded / (1024 * 1024)
+                        slot["message"] = f"{file_name}: {mb_done:.1f} MB"
+                    _publish_status()
+
+                ranged = (not resumed and total_size >= _RANGED_MIN_SIZE
+                          and response.headers.get('accept-ranges', '').lower() == 'bytes'
+                          and not response.headers.get('content-encoding'))
+                if ranged:
+                    response.close()
+                    if not _ranged_download(url, headers, total_size, temp_path, report):
+                        # Server ignored the Range header; start over as a single stream
+                        ranged = False
+                        response = _HTTP.get(url, headers=headers, stream=True, allow_redirects=True, timeout=_HTTP_TIMEOUT)
+                        response.raise_for_status()
+
+                if not ranged:
+                    with open(temp_path, 'ab' if resumed else 'wb', buffering=_DOWNLOAD_CHUNK) as f:
+                        if not resumed and total_size > 0 and not response.headers.get('content-encoding'):
+                            _preallocate(f, total_size)
+                        downloaded = _pipelined_write(_iter_body(response), f, report, existing)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    if total_size > 0 and not response.headers.get('content-encoding') and downloaded != total_size:
+                        raise _IncompleteDownload(f"Incomplete download of {file_name}: got {downloaded} of {total_size} bytes")
+
+                slot["message"] = f"Installing {file_name}..."
+                _publish_status()
+                _drop_page_cache(temp_path)
+                try:
+                    os.remove(_partial_meta_path(temp_path))
+                except OSError:
+                    pass
+                if os.path.dirname(temp_path) == target_dir:
+                    os.replace(temp_path, target_abs_path)
+                else:
+                    import shutil
+                    os.makedirs(target_dir, exist_ok=True)
+                    shutil.move(temp_path, target_abs_path)
                 print(f"[UmiAI] Installed {model_name} -> {target_abs_path}")
 
-            update_installed_version(model_name, target_model.get("version", ""))
-            download_status[model_name] = {"status": "success", "message": "Installed"}
+            update_installed_version(model_name, target_version)
+            _set_status(model_name, {"status": "success", "message": "Installed"})
 
         except Exception as e:
             is_auth_error = False
@@ -746,23 +1459,84 @@ def worker_loop():
             elif "404" in err_msg or "EntryNotFoundError" in err_msg:
                 err_msg = "File not found (404)"
 
-            download_status[model_name] = {"status": status_code, "message": err_msg}
-            print(f"[UmiAI] Download failed for {model_name}: {err_msg}")
+            if _is_transient_error(e) and attempt + 1 < _MAX_DOWNLOAD_ATTEMPTS:
+                # Requeue from a timer so this worker can take the next job meanwhile
+                retrying = True
+                delay = min(2 ** (attempt + 1), 30)
+                _set_status(model_name, {"status": "queued", "message": f"{err_msg} (retrying in {delay}s)"})
+                print(f"[UmiAI] Download failed for {model_name}: {err_msg}; retrying in {delay}s")
+                timer = threading.Timer(delay, _enqueue_download,
+                                        (repo_id, model_name, target_model, priority + 1, attempt + 1))
+                timer.daemon = True
+                timer.start()
+            else:
+                _set_status(model_name, {"status": status_code, "message": err_msg})
+                print(f"[UmiAI] Download failed for {model_name}: {err_msg}")
         finally:
+            if not retrying:
+                with _status_lock:
+                    _in_flight.discard((repo_id, model_name))
             download_queue.task_done()
 
-threading.Thread(target=worker_loop, daemon=True).start()
+def _max_parallel_downloads():
+    try:
+        return max(1, int(get_umi_config().get("max_parallel_downloads", 3)))
+    except (TypeError, ValueError):
+        return 3
+
+for _ in range(_max_parallel_downloads()):
+    threading.Thread(target=worker_loop, daemon=True).start()
 
 @PromptServer.instance.routes.get("/umiapp/models/status")
 async def get_download_status(request):
-    return web.json_response(download_status)
+    # Re-serialize only when something changed since the last poll
+    version = _status_state['version']
+    if _status_snapshot['version'] != version:
+        _status_snapshot['body'] = _json_body(_status_copy())
+        _status_snapshot['version'] = version
+    return web.Response(body=_status_snapshot['body'], content_type='application/json')
+
+@PromptServer.instance.routes.get("/umiapp/models/events")
+async def download_events(request):
+    """Server-sent events: pushes download_status entries whenever they change."""
+    loop = asyncio.get_running_loop()
+    _status_state['loop'] = loop
+    response = web.StreamResponse(headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"})
+    await response.prepare(request)
+
+    sent = {}
+    try:
+        while True:
+            # Register before diffing so a change made in between still wakes us
+            waiter = loop.create_future()
+            _status_waiters.add(waiter)
+            changed = {}
+            current = _status_copy()
+            for name, value in current.items():
+                if sent.get(name) != value:
+                    changed[name] = sent[name] = value
+            if len(sent) > len(current):
+                # Forget entries evicted from download_status
+                sent = {name: sent[name] for name in current}
+            if changed:
+                await response.write(b"data: " + _json_body(changed) + b"\n\n")
+            try:
+                await asyncio.wait_for(waiter, 15)
+            except asyncio.TimeoutError:
+                _status_waiters.discard(waiter)
+                await response.write(b": keep-alive\n\n")
+    except ConnectionResetError:
+        pass
+    return response
 
 @PromptServer.instance.routes.post("/umiapp/models/save_token")
 async def save_api_token(request):
     try:
         data = await request.json()
         token = data.get("token", "")
-        save_umi_config({"civitai_token": token})
+        # Disk write (and the config lock download workers also take) stays off the event loop
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, save_umi_config, {"civitai_token": token})
         return web.json_response({"status": "saved"})
     except Exception as e:
         return web.json_response({"error": str(e)}, status=500)
@@ -777,12 +1551,118 @@ async def set_active_version(request):
         if not model_name or not version:
             return web.json_response({"error": "Missing parameters"}, status=400)
 
-        update_installed_version(model_name, version)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, update_installed_version, model_name, version)
         return web.json_response({"status": "updated", "message": f"Set active version for {model_name} to {version}"})
 
     except Exception as e:
         return web.json_response({"error": str(e)}, status=500)
 
+try:
+    from packaging import version as _pkg_version
+except ImportError:
+    _pkg_version = None
+
+@functools.lru_cache(maxsize=4096)
+def _parse_version(v):
+    # Raises (and callers fall back to string order) when packaging is missing or v is invalid
+    return _pkg_version.parse(v)
+
+def _existing_paths(rel_paths):
+    """Return the subset of rel_paths that exist, scanning each parent directory once."""
+    listings = {}
+    found = set()
+    for rel in rel_paths:
+        parent, name = os.path.split(resolve_path(rel))
+        names = listings.get(parent)
+        if names is None:
+            try:
+                with os.scandir(parent) as it:
+                    names = {os.path.normcase(e.name) for e in it}
+            except OSError:
+                names = set()
+            listings[parent] = names
+        if os.path.normcase(name) in names:
+            found.add(rel)
+    return found
+
+def _models_status(repo_id, force_refresh=False):
+    config = _fetch_model_config(repo_id, force_refresh=force_refresh)
+    config = _filter_models_for_core(config)
+
+    active_registry = get_installed_version_info()
+
+    # One directory listing per parent instead of a stat per file per version
+    wanted = []
+    for model in config.get("models", []):
+        files = model.get("files") or []
+        if files:
+            wanted.extend(f.get("local_path") for f in files if f.get("local_path"))
+        else:
+            wanted.append(model.get("local_path", ""))
+    present = _existing_paths(wanted)
+
+    grouped_models = {}
+    for model in config.get("models", []):
+        name = model["name"]
+        grouped_models.setdefault(name, []).append(model)
+
+    models_status = []
+    for name, variants in grouped_models.items():
+        try:
+            variants.sort(key=lambda x: _parse_version(x["version"]), reverse=True)
+        except Exception:
+            variants.sort(key=lambda x: str(x["version"]), reverse=True)
+
+        latest = variants[0]
+        active_ver = active_registry.get(name, None)
+
+        installed_versions = []
+        for v in variants:
+            files = v.get("files") or []
+            if files:
+                all_found = True
+                for f in files:
+                    file_path = f.get("local_path") or ""
+                    if not file_path:
+                        all_found = False
+                        break
+                    if file_path not in present:
+                        all_found = False
+                        break
+                if all_found:
+                    installed_versions.append(v["version"])
+            else:
+                if v.get("local_path", "") in present:
+                    installed_versions.append(v["version"])
+
+        if active_ver and active_ver not in installed_versions:
+            active_ver = None
+
+        if not active_ver and installed_versions:
+            for v in variants:
+                if v["version"] in installed_versions:
+                    active_ver = v["version"]
+                    break
+
+        status = "missing"
+        if active_ver:
+            status = "installed" if active_ver == latest["version"] else "outdated"
+        elif installed_versions:
+            status = "outdated"
+
+        models_status.append({
+            "name": name,
+            "status": status,
+            "active_version": active_ver,
+            "installed_versions": installed_versions,
+            "version": latest["version"],
+            "versions": variants,
+            "description": latest.get("description", "")
+        })
+
+    return models_status
+
 @PromptServer.instance.routes.get("/umiapp/models/check")
 async def check_models(request):
     repo_id = request.rel_url.query.get("repo_id", "")
@@ -795,82 +1675,16 @@ async def check_models(request):
     if not HF_HUB_AVAILABLE:
         return web.json_response({"error": "huggingface_hub is not installed"}, status=500)
 
-    try:
-        def fetch_config():
-            return _fetch_model_config(repo_id)
+    force_refresh = request.rel_url.query.get("force_refresh", "") in ("1", "true")
 
+    try:
         try:
             loop = asyncio.get_running_loop()
         except RuntimeError:
             loop = asyncio.get_event_loop()
 
-        config = await loop.run_in_executor(None, fetch_config)
-        config = _filter_models_for_core(config)
-
-        active_registry = get_installed_version_info()
-
-        grouped_models = {}
-        for model in config.get("models", []):
-            name = model["name"]
-            grouped_models.setdefault(name, []).append(model)
-
-        models_status = []
-        for name, variants in grouped_models.items():
-            try:
-                from packaging import version
-                variants.sort(key=lambda x: version.parse(x["version"]), reverse=True)
-            except Exception:
-                variants.sort(key=lambda x: str(x["version"]), reverse=True)
-
-            latest = variants[0]
-            active_ver = active_registry.get(name, None)
-
-            installed_versions = []
-            for v in variants:
-                files = v.get("files") or []
-                if files:
-                    all_found = True
-                    for f in files:
-                        file_path = f.get("local_path") or ""
-                        if not file_path:
-                            all_found = False
-                            break
-                        if not os.path.exists(resolve_path(file_path)):
-                            all_found = False
-                            break
-                    if all_found:
-                        installed_versions.append(v["version"])
-                else:
-                    full_path = resolve_path(v.get("local_path", ""))
-                    if os.path.exists(full_path):
-                        installed_versions.append(v["version"])
-
-            if active_ver and active_ver not in installed_versions:
-                active_ver = None
-
-            if not active_ver and installed_versions:
-                for v in variants:
-                    if v["version"] in installed_versions:
-                        active_ver = v["version"]
-                        break
-
-            status = "missing"
-            if active_ver:
-                status = "installed" if active_ver == latest["version"] else "outdated"
-            elif installed_versions:
-                status = "outdated"
-
-            models_status.append({
-                "name": name,
-                "status": status,
-                "active_version": active_ver,
-                "installed_versions": installed_versions,
-                "version": latest["version"],
-                "versions": variants,
-                "description": latest.get("description", "")
-            })
-
-        return web.json_response({"models": models_status})
+        models_status = await loop.run_in_executor(None, _models_status, repo_id, force_refresh)
+        return _json_response({"models": models_status})
 
     except Exception as e:
         err_msg = str(e)
@@ -919,8 +1733,13 @@ async def download_model(request):
         if not target_model:
             return web.json_response({"error": f"Model '{model_name}' (v{target_version}) not found in config"}, status=404)
 
-        download_status[model_name] = {"status": "queued", "message": "Queued in backend..."}
-        download_queue.put((repo_id, model_name, target_model))
+        with _status_lock:
+            if (repo_id, model_name) in _in_flight:
+                return web.json_response({"status": "already_queued", "message": f"{model_name} is already queued"})
+            _in_flight.add((repo_id, model_name))
+            _store_status(model_name, {"status": "queued", "message": "Queued in backend..."})
+        _publish_status()
+        _enqueue_download(repo_id, model_name, target_model)
 
         return web.json_response({"status": "queued", "message": f"Download queued for {model_name}"})
 
@@ -933,9 +1752,10 @@ async def download_model(request):
 @PromptServer.instance.routes.get("/umiapp/models/progress")
 async def get_download_progress(request):
     download_id = request.query.get("id", "")
-    if download_id and download_id in download_status:
-        return web.json_response(download_status[download_id])
-    return web.json_response(download_status)
+    entry = download_status.get(download_id) if download_id else None
+    if entry is not None:
+        return _json_response(dict(entry))
+    return _json_response(_status_copy())
 
 # 2. Mappings
 CORE_NODE_CLASS_MAPPINGS = {
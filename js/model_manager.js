@@ -8,6 +8,8 @@
     let models = [];
     let downloadStatuses = {};
     let pollingInterval = null;
+    let statusEvents = null;
+    let statusEventsRetry = null;
     let isLoading = false;
 
     const DEFAULT_REPO_ID = 'Tinuva/Comfy-Umi';
@@ -292,7 +294,7 @@
         repoLabel.textContent = repoId ? `Repo: ${repoId}` : '';
 
         try {
-            const response = await fetch(`/umiapp/models/check?repo_id=${encodeURIComponent(repoId)}`);
+            const response = await fetch(`/umiapp/models/check?repo_id=${encodeURIComponent(repoId)}&force_refresh=1`);
             const data = await response.json();
             if (data.error) {
                 content.innerHTML = `<div class="umi-mm-loading">Error: ${data.error}</div>`;
@@ -344,7 +346,28 @@
 
     function startPolling() {
         if (pollingInterval) clearInterval(pollingInterval);
-        pollingInterval = setInterval(updateStatuses, 2000);
+        pollingInterval = null;
+        if (!window.EventSource) {
+            pollingInterval = setInterval(updateStatuses, 2000);
+            return;
+        }
+        if (statusEvents) return;
+
+        // The backend pushes only the entries that changed
+        statusEvents = new EventSource('/umiapp/models/events');
+        statusEvents.onmessage = (event) => {
+            Object.assign(downloadStatuses, JSON.parse(event.data));
+            if (models.length > 0) renderList();
+        };
+        statusEvents.onerror = () => {
+            // Older backend or broken stream: go back to polling
+            statusEvents.close();
+            statusEvents = null;
+            if (!pollingInterval) pollingInterval = setInterval(updateStatuses, 2000);
+            // A dropped connection (server restart, proxy timeout) shouldn't mean polling forever
+            clearTimeout(statusEventsRetry);
+            statusEventsRetry = setTimeout(startPolling, 30000);
+        };
     }
 
     function normalizeVer(v) {
@@ -475,31 +498,38 @@
         }
     }
 
-    async function downloadModel(modelName, version) {
-        const repoId = getRepoId();
+    async function queueDownload(repoId, modelName, version) {
         try {
             await fetch('/umiapp/models/download', {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
                 body: JSON.stringify({ repo_id: repoId, model_name: modelName, version: version })
             });
-            await updateStatuses();
         } catch (e) {
         }
     }
 
+    async function downloadModel(modelName, version) {
+        await queueDownload(getRepoId(), modelName, version);
+        await updateStatuses();
+    }
+
     async function downloadAll() {
         const downloadAllBtn = document.getElementById('umi-mm-download-all');
         downloadAllBtn.disabled = true;
         downloadAllBtn.textContent = 'Downloading...';
 
+        // Queue everything at once; the backend worker pool bounds how many run in parallel
+        const repoId = getRepoId();
+        const pending = [];
         for (const model of models) {
             const targetVer = model.active_version || model.version;
             if (!modelHasVersion(model, targetVer)) {
-                await downloadModel(model.name, targetVer);
-                await new Promise(r => setTimeout(r, 1000));
+                pending.push(queueDownload(repoId, model.name, targetVer));
             }
         }
+        await Promise.all(pending);
+        await updateStatuses();
 
         downloadAllBtn.textContent = 'Download All Missing/Updates';
         downloadAllBtn.disabled = false;
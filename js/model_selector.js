@@ -60,7 +60,7 @@ class UmiSelectorWidget {
         if (this.refreshBtn) this.refreshBtn.textContent = "...";
 
         try {
-            const response = await api.fetchApi(`/umiapp/models/check?repo_id=${encodeURIComponent(repoId)}`);
+            const response = await api.fetchApi(`/umiapp/models/check?repo_id=${encodeURIComponent(repoId)}&force_refresh=1`);
             const data = await response.json();
             if (data.models) {
                 this.models = data.models;
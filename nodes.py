@@ -1,4 +1,5 @@
 import os
+import asyncio
 import random
 import re
 import yaml
@@ -7,11 +8,15 @@ import json
 import csv
 import requests
 import fnmatch
+import bisect
+import itertools
+import functools
 import gc 
 import sys
 import subprocess
+import threading
 from datetime import datetime
-from collections import Counter, OrderedDict
+from collections import Counter
 import folder_paths
 import comfy.sd
 import comfy.utils
@@ -29,17 +34,23 @@ import server
 from aiohttp import web
 
 import importlib
+import importlib.util
 import sys
 
 # Import shared utilities
 from . import shared_utils
-importlib.reload(shared_utils)
+# Re-executing shared_utils doubles its import cost and swaps out its classes and caches; dev opt-in only
+if os.environ.get('UMI_DEV_RELOAD'):
+    importlib.reload(shared_utils)
 
 from .shared_utils import (
     escape_unweighted_colons, parse_wildcard_weight, get_all_wildcard_paths, log_prompt_to_history,
     LogicEvaluator, DynamicPromptReplacer, VariableReplacer, NegativePromptGenerator,
     ConditionalReplacer, TagLoaderBase, TagSelectorBase, LoRAHandlerBase, TagReplacerBase,
-    CharacterReplacer, resolve_lora_alias
+    CharacterReplacer, resolve_lora_alias, drop_stale_cache_entries, _YamlLoader, _json_response,
+    _parse_yaml_tags_cached, YAML_TAGS_CACHE, strip_double_slash_comments,
+    append_trace_summary, append_debug_summary, _load_yaml_cached, _atomic_write_json, _read_json_file,
+    _extract_tags_stream
 )
 
 # ==============================================================================
@@ -51,8 +62,55 @@ GLOBAL_INDEX = {'built': False, 'files': set(), 'entries': {}, 'tags': set()}
 # Fix 12: File modification time cache to skip rescanning unchanged files
 FILE_MTIME_CACHE = {}
 
-# LRU CACHE
-LORA_MEMORY_CACHE = OrderedDict()
+# Parsed YAML index data per file: path -> (mtime_ns, keys, entries)
+YAML_INDEX_CACHE = {}
+
+# TagLoader file maps shared across runs: (roots, use_folder_paths) -> {'mtimes': {dir: mtime_ns}, 'maps': (txt, yaml, csv)}
+_LOOKUP_MAPS_CACHE = {}
+
+# Thread cap for parsing uncached YAMLs during a cold build_index
+_INDEX_PARSE_WORKERS = 8
+
+# YAML_INDEX_CACHE persisted across restarts, next to the __init__ tag index
+YAML_INDEX_SIDECAR = os.path.join(os.path.dirname(__file__), "wildcards", ".cache", "yaml_index.json")
+_YAML_INDEX_SIDECAR_VERSION = 1
+
+def _load_yaml_index_sidecar():
+    """Seed YAML_INDEX_CACHE from disk; entries only count while their mtime still matches."""
+    cached = _read_json_file(YAML_INDEX_SIDECAR, None)
+    if not isinstance(cached, dict) or cached.get('version') != _YAML_INDEX_SIDECAR_VERSION:
+        return
+    for path, item in (cached.get('files') or {}).items():
+        try:
+            YAML_INDEX_CACHE.setdefault(path, (item['mtime'], item['keys'], item['entries']))
+        except (KeyError, TypeError):
+            continue
+
+def _save_yaml_index_sidecar(paths):
+    """Write the cached parses of the given YAML paths back to the sidecar."""
+    if not os.path.isdir(os.path.dirname(os.path.dirname(YAML_INDEX_SIDECAR))):
+        return
+    files = {}
+    for path in paths:
+        cached = YAML_INDEX_CACHE.get(path)
+        if cached is None:
+            continue
+        item = {'mtime': cached[0], 'keys': cached[1], 'entries': cached[2]}
+        # Skip files whose data wouldn't survive JSON as is (dates, non-string keys); they just get reparsed
+        try:
+            if json.loads(json.dumps(item)) != item:
+                continue
+        except (TypeError, ValueError):
+            continue
+        files[path] = item
+    try:
+        os.makedirs(os.path.dirname(YAML_INDEX_SIDECAR), exist_ok=True)
+        _atomic_write_json(YAML_INDEX_SIDECAR, {'version': _YAML_INDEX_SIDECAR_VERSION, 'files': files}, indent=None)
+    except OSError as e:
+        print(f"[UmiAI] Could not write YAML index cache {YAML_INDEX_SIDECAR}: {e}")
+
+# LRU CACHE (plain dict: insertion order is recency, oldest first)
+LORA_MEMORY_CACHE = {}
 
 # REGISTER LLM FOLDER
 folder_paths.add_model_folder_path("llm", os.path.join(folder_paths.models_dir, "llm"))
@@ -68,12 +126,8 @@ try:
 except ImportError:
     pass
 
-HF_HUB_AVAILABLE = False
-try:
-    from huggingface_hub import hf_hub_download
-    HF_HUB_AVAILABLE = True
-except ImportError:
-    pass
+# Imported on first download; huggingface_hub adds noticeably to startup time
+HF_HUB_AVAILABLE = importlib.util.find_spec("huggingface_hub") is not None
 
 # ==============================================================================
 # AUTO-UPDATE LOGIC
@@ -244,22 +298,6 @@ def parse_tag(tag):
 def read_file_lines(file):
     f_lines = file.read().splitlines()
     lines = []
-    def strip_double_slash_comments(line):
-        i = 0
-        in_comment = False
-        out = []
-        while i < len(line):
-            if line[i] == '/' and i + 1 < len(line) and line[i + 1] == '/':
-                in_comment = not in_comment
-                i += 2
-                continue
-            if in_comment:
-                i += 1
-                continue
-            out.append(line[i])
-            i += 1
-        return "".join(out).strip()
-
     for line in f_lines:
         line = line.strip()
         if not line:
@@ -271,7 +309,7 @@ def read_file_lines(file):
             if not line:
                 continue
         if '#' in line:
-            line = line.split('#')[0].strip()
+            line = line.partition('#')[0].strip()
 
         # Parse using shared utility function
         parsed = parse_wildcard_weight(line)
@@ -279,98 +317,6 @@ def read_file_lines(file):
 
     return lines
 
-def append_trace_summary(prompt, variables):
-    summary = variables.get('trace_summary')
-    if not summary or str(summary).strip() in ("0", "false", "False"):
-        return prompt
-
-    def _level(val):
-        if val is None:
-            return 1
-        if isinstance(val, (int, float)):
-            return max(0, int(val))
-        s = str(val).strip()
-        if s.isdigit():
-            return int(s)
-        if s.lower() in ("true", "yes", "on"):
-            return 1
-        return 0
-
-    level = _level(variables.get('trace'))
-    parts = [
-        "TRACE",
-        f"seed={variables.get('trace_seed', '')}",
-        f"run={variables.get('trace_run_id', '')}",
-    ]
-    if variables.get('trace_last_type'):
-        parts.append(f"type={variables.get('trace_last_type')}")
-    if variables.get('trace_last_source'):
-        parts.append(f"src={variables.get('trace_last_source')}")
-    if variables.get('trace_last_pick'):
-        parts.append(f"pick={variables.get('trace_last_pick')}")
-    if level >= 2:
-        if variables.get('trace_row_id'):
-            parts.append(f"row_id={variables.get('trace_row_id')}")
-        if variables.get('trace_row_index'):
-            parts.append(f"row={variables.get('trace_row_index')}")
-        if variables.get('trace_yaml_entry'):
-            parts.append(f"yaml={variables.get('trace_yaml_entry')}")
-        if variables.get('trace_last_roll') and variables.get('trace_last_total_weight'):
-            parts.append(f"roll={variables.get('trace_last_roll')}/{variables.get('trace_last_total_weight')}")
-        if variables.get('trace_last_condition'):
-            parts.append(f"cond={variables.get('trace_last_condition')}")
-        if variables.get('trace_last_branch'):
-            parts.append(f"branch={variables.get('trace_last_branch')}")
-        if variables.get('trace_last_var') and variables.get('trace_last_var_source'):
-            parts.append(f"var={variables.get('trace_last_var')}:{variables.get('trace_last_var_source')}")
-
-    trace_line = "<<{}>>".format(" | ".join(p for p in parts if p))
-    return f"{trace_line}\n{prompt}"
-
-def append_debug_summary(prompt, variables):
-    summary = variables.get('debug_summary')
-    if not summary or str(summary).strip() in ("0", "false", "False"):
-        return prompt
-
-    def _level(val):
-        if val is None:
-            return 1
-        if isinstance(val, (int, float)):
-            return max(0, int(val))
-        s = str(val).strip()
-        if s.isdigit():
-            return int(s)
-        if s.lower() in ("true", "yes", "on"):
-            return 1
-        return 0
-
-    level = _level(variables.get('debug'))
-    parts = [
-        "DBG",
-        f"seed={variables.get('debug_seed', '')}",
-        f"run={variables.get('debug_run_id', '')}",
-    ]
-    if variables.get('debug_last_type'):
-        parts.append(f"type={variables.get('debug_last_type')}")
-    if variables.get('debug_last_source'):
-        parts.append(f"src={variables.get('debug_last_source')}")
-    if variables.get('debug_last_pick'):
-        parts.append(f"pick={variables.get('debug_last_pick')}")
-    if level >= 2:
-        if variables.get('debug_last_count'):
-            parts.append(f"count={variables.get('debug_last_count')}")
-        if variables.get('debug_row_id'):
-            parts.append(f"row_id={variables.get('debug_row_id')}")
-        if variables.get('debug_row_index'):
-            parts.append(f"row={variables.get('debug_row_index')}")
-        if variables.get('debug_yaml_entry'):
-            parts.append(f"yaml={variables.get('debug_yaml_entry')}")
-        if variables.get('debug_last_roll') and variables.get('debug_last_total_weight'):
-            parts.append(f"roll={variables.get('debug_last_roll')}/{variables.get('debug_last_total_weight')}")
-
-    dbg_line = "<<{}>>".format(" | ".join(p for p in parts if p))
-    return f"{dbg_line}\n{prompt}"
-
 def parse_wildcard_range(range_str, num_variants):
     if range_str is None:
         return 1, 1
@@ -397,7 +343,7 @@ def process_wildcard_range(tag, lines, rng):
     if "$$" not in tag:
         selected = rng.choice(lines)
         if '#' in selected:
-            selected = selected.split('#')[0].strip()
+            selected = selected.partition('#')[0].strip()
         return selected
         
     range_str, tag_name = tag.split("$$", 1)
@@ -408,15 +354,51 @@ def process_wildcard_range(tag, lines, rng):
             return ""
             
         selected = rng.sample(lines, min(num_items, len(lines)))
-        selected = [line.split('#')[0].strip() if '#' in line else line for line in selected]
+        selected = [line.partition('#')[0].strip() if '#' in line else line for line in selected]
         return ", ".join(selected)
     except Exception as e:
         print(f"Error processing wildcard range: {e}")
         selected = rng.choice(lines)
         if '#' in selected:
-            selected = selected.split('#')[0].strip()
+            selected = selected.partition('#')[0].strip()
         return selected
 
+# Sorted (files_index, normcased keys, keys) snapshot for prefix-bounded glob lookups
+_GLOB_VIEW = {'view': None}
+_GLOB_LITERAL_PREFIX_RE = re.compile(r'[^*?\[]*')
+
+@functools.lru_cache(maxsize=256)
+def _glob_matcher(pat):
+    return re.compile(fnmatch.translate(pat)).match
+
+def _walk_files_topdown(root, dir_mtimes=None):
+    """Yield (folder prefix with '/', DirEntry) for every file below root, in os.walk's top-down order.
+
+    If dir_mtimes is given, each visited directory's st_mtime_ns is recorded in it before it is listed.
+    """
+    # scandir's cached d_type replaces os.walk's per-entry checks; first-found-wins lookups rely on the order
+    stack = [(root, '')]
+    while stack:
+        directory, prefix = stack.pop()
+        try:
+            if dir_mtimes is not None:
+                dir_mtimes[directory] = os.stat(directory).st_mtime_ns
+            it = os.scandir(directory)
+        except OSError:
+            continue
+        subdirs = []
+        with it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if not is_dir:
+                    yield prefix, entry
+                elif not entry.is_symlink():
+                    subdirs.append((entry.path, f"{prefix}{entry.name}/"))
+        stack.extend(reversed(subdirs))
+
 # ==============================================================================
 # CORE CLASSES
 # ==============================================================================
@@ -430,6 +412,8 @@ class TagLoader(TagLoaderBase):
         self.loaded_tags = {}
         self.yaml_entries = {}
         self.index_built = False
+        # Set by index_yaml_file when it had to parse, so build_index knows to rewrite the sidecar
+        self.index_dirty = False
         # Toggle: False = filename only (__MyFile__), True = include folder paths (__Series/MyFile__)
         self.use_folder_paths = options.get('use_folder_paths', False)
         
@@ -437,43 +421,71 @@ class TagLoader(TagLoaderBase):
         self.yaml_lookup = {}
         self.csv_lookup = {}
         
-        self.refresh_maps()
+        # Reuse the maps from an earlier run over the same roots unless a walked directory changed
+        cached = _LOOKUP_MAPS_CACHE.get(self._maps_cache_key())
+        if cached and self._dirs_unchanged(cached['mtimes']):
+            self.txt_lookup, self.yaml_lookup, self.csv_lookup = cached['maps']
+        else:
+            self.refresh_maps()
+
+    def _maps_cache_key(self):
+        return (tuple(self.wildcard_locations), self.use_folder_paths)
+
+    @staticmethod
+    def _dirs_unchanged(dir_mtimes):
+        """True if every directory from the last walk still has its recorded mtime (None = was missing)."""
+        # Adding, removing or renaming a file or folder bumps its parent directory's mtime
+        for directory, mtime_ns in dir_mtimes.items():
+            try:
+                current = os.stat(directory).st_mtime_ns
+            except OSError:
+                current = None
+            if current != mtime_ns:
+                return False
+        return True
+
+    @staticmethod
+    def invalidate():
+        """Drop the shared lookup maps so the next TagLoader walks the wildcard tree again."""
+        _LOOKUP_MAPS_CACHE.clear()
 
     def refresh_maps(self):
+        dir_mtimes = {}
         self.txt_lookup = {}
         self.yaml_lookup = {}
         self.csv_lookup = {}
+        lookups = {'.txt': self.txt_lookup, '.yaml': self.yaml_lookup, '.csv': self.csv_lookup}
         
         for location in self.wildcard_locations:
             if not os.path.exists(location):
+                # Recorded as missing so the maps are rebuilt once the folder appears
+                dir_mtimes[location] = None
                 continue
                 
-            for root, dirs, files in os.walk(location):
-                for file in files:
-                    full_path = os.path.join(root, file)
-                    
-                    # Toggle between filename-only and full path modes
-                    if self.use_folder_paths:
-                        # Full path mode: __Series/A Centaur's Life__
-                        rel_path = os.path.relpath(full_path, location)
-                        key = os.path.splitext(rel_path)[0].replace(os.sep, '/')
-                    else:
-                        # Filename only mode: __A Centaur's Life__
-                        key = os.path.splitext(file)[0]
-                    
-                    name_lower = file.lower()
-                    key_lower = key.lower()
-                    
-                    if name_lower.endswith('.txt'):
-                        # Handle conflicts by keeping first found
-                        if key_lower not in self.txt_lookup:
-                            self.txt_lookup[key_lower] = full_path
-                    elif name_lower.endswith('.yaml'):
-                        if key_lower not in self.yaml_lookup:
-                            self.yaml_lookup[key_lower] = full_path
-                    elif name_lower.endswith('.csv'):
-                        if key_lower not in self.csv_lookup:
-                            self.csv_lookup[key_lower] = full_path
+            for prefix, entry in _walk_files_topdown(location, dir_mtimes):
+                file = entry.name
+                # Pick the lookup from the lowercased extension alone, before any key is built
+                lookup = lookups.get(file[file.rfind('.'):].lower())
+                if lookup is None:
+                    continue
+                
+                # Toggle between filename-only and full path modes
+                if self.use_folder_paths:
+                    # Full path mode: __Series/A Centaur's Life__
+                    key = prefix + os.path.splitext(file)[0]
+                else:
+                    # Filename only mode: __A Centaur's Life__
+                    key = os.path.splitext(file)[0]
+                
+                # Handle conflicts by keeping first found
+                key_lower = key.lower()
+                if key_lower not in lookup:
+                    lookup[key_lower] = entry.path
+
+        _LOOKUP_MAPS_CACHE[self._maps_cache_key()] = {
+            'mtimes': dir_mtimes,
+            'maps': (self.txt_lookup, self.yaml_lookup, self.csv_lookup),
+        }
 
     def load_prompt_file(self, file_key):
         """Phase 6: Load entire .txt file content as a prompt (no parsing)"""
@@ -519,6 +531,10 @@ class TagLoader(TagLoaderBase):
         if self.index_built:
             return
 
+        # Cold start: reuse the previous process's parses for every YAML that hasn't changed
+        if not YAML_INDEX_CACHE:
+            _load_yaml_index_sidecar()
+
         new_index = set()
         new_entries = {}
         new_tags = set()
@@ -528,25 +544,24 @@ class TagLoader(TagLoaderBase):
         for key in self.csv_lookup.keys():
             new_index.add(key)
 
-        for file_key, full_path in self.yaml_lookup.items():
-            if file_key == 'globals':
-                continue
-            try:
-                with open(full_path, encoding="utf8") as f:
-                    data = yaml.safe_load(f)
+        yaml_paths = [full_path for file_key, full_path in self.yaml_lookup.items() if file_key != 'globals']
+        if sum(path not in YAML_INDEX_CACHE for path in yaml_paths) > 1:
+            # Several never-parsed files (cold start): overlap their reads; results merge in lookup order
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=min(_INDEX_PARSE_WORKERS, len(yaml_paths))) as pool:
+                indexed = list(pool.map(self.index_yaml_file, yaml_paths))
+        else:
+            indexed = map(self.index_yaml_file, yaml_paths)
 
-                    # Phase 7: Unified YAML format - always process entries with tags
-                    if isinstance(data, dict):
-                        for k, v in data.items():
-                            new_index.add(k)
-                            if isinstance(v, dict):
-                                processed = self.process_yaml_entry(k, v)
-                                if processed['tags']:
-                                    new_entries[k.lower()] = processed
-                                    for t in processed['tags']:
-                                        new_tags.add(t)
-            except Exception as e:
-                pass
+        for keys, entries in indexed:
+            new_index.update(keys)
+            new_entries.update(entries)
+            for processed in entries.values():
+                new_tags.update(processed['tags'])
+
+        if self.index_dirty:
+            _save_yaml_index_sidecar(self.yaml_lookup.values())
+            self.index_dirty = False
 
         self.files_index = new_index
         self.yaml_entries = new_entries
@@ -559,16 +574,64 @@ class TagLoader(TagLoaderBase):
         GLOBAL_INDEX['built'] = True
         GLOBAL_INDEX['use_folder_paths'] = self.use_folder_paths
 
+    def index_yaml_file(self, full_path):
+        """Return (keys, tagged entries) of a YAML file, reusing the last parse while its mtime is unchanged."""
+        try:
+            mtime = os.stat(full_path).st_mtime_ns
+        except OSError:
+            return [], {}
+        cached = YAML_INDEX_CACHE.get(full_path)
+        if cached and cached[0] == mtime:
+            return cached[1], cached[2]
+
+        keys = []
+        entries = {}
+        try:
+            # Raw bytes: libyaml decodes the buffer itself instead of going through a Python text layer
+            with open(full_path, 'rb') as f:
+                raw = f.read()
+
+            data = None
+            if b'Tags' in raw:
+                data = yaml.load(raw, Loader=_YamlLoader)
+            else:
+                # Untagged file: only the top-level keys get indexed, so read them off the
+                # event stream instead of building every entry's Prompts/Prefix/Suffix
+                try:
+                    tags, keys = _extract_tags_stream(io.BytesIO(raw))
+                except Exception:
+                    tags, keys = None, []
+                if tags is None or tags:
+                    keys = []
+                    data = yaml.load(raw, Loader=_YamlLoader)
+
+            # Phase 7: Unified YAML format - always process entries with tags
+            if isinstance(data, dict):
+                for k, v in data.items():
+                    # Keys as text, like the event-stream scrape gives them (`5` -> "5", `yes` -> "True")
+                    k = str(k)
+                    keys.append(k)
+                    if isinstance(v, dict):
+                        processed = self.process_yaml_entry(k, v)
+                        if processed['tags']:
+                            entries[k.lower()] = processed
+        except Exception as e:
+            pass
+
+        YAML_INDEX_CACHE[full_path] = (mtime, keys, entries)
+        self.index_dirty = True
+        return keys, entries
+
     def load_globals(self):
         merged_globals = {}
         for location in self.wildcard_locations:
             global_path = os.path.join(location, 'globals.yaml')
             if os.path.exists(global_path):
                 try:
-                    with open(global_path, 'r', encoding='utf-8') as f:
-                        data = yaml.safe_load(f)
-                        if isinstance(data, dict):
-                            merged_globals.update({str(k): str(v) for k, v in data.items()})
+                    # Reparsed only when the file changes; this runs on every generation
+                    data = _load_yaml_cached(global_path)
+                    if isinstance(data, dict):
+                        merged_globals.update({str(k): str(v) for k, v in data.items()})
                 except yaml.YAMLError as e:
                     print(f"[UmiAI] ERROR: Malformed globals.yaml at {global_path}: {e}")
                     print(f"[UmiAI] Global variables from this file will not be loaded. Please fix YAML syntax.")
@@ -653,9 +716,9 @@ class TagLoader(TagLoaderBase):
                     break
         
         if found_file:
-            with open(found_file, encoding="utf8") as file:
+            with open(found_file, 'rb') as file:
                 try:
-                    data = yaml.safe_load(file)
+                    data = yaml.load(file, Loader=_YamlLoader)
 
                     # Phase 7: Unified YAML format - always process entries with tags
                     if isinstance(data, dict):
@@ -694,13 +757,53 @@ class TagLoader(TagLoaderBase):
 
     def get_glob_matches(self, pattern):
         self.build_index()
-        return fnmatch.filter(self.files_index, pattern)
+        files = self.files_index
+        view = _GLOB_VIEW['view']
+        if view is None or view[0] is not files:
+            # files_index is replaced, never mutated, on rebuild; re-sort only when it changes
+            if os.name == 'nt':
+                pairs = sorted((os.path.normcase(key), key) for key in files if isinstance(key, str))
+                view = (files, [norm for norm, _ in pairs], [key for _, key in pairs])
+            else:
+                # normcase is a no-op on POSIX, so one sorted list serves as both
+                keys = sorted(key for key in files if isinstance(key, str))
+                view = (files, keys, keys)
+            _GLOB_VIEW['view'] = view
+        _, norms, keys = view
+
+        # Same matching as fnmatch.filter, but only over keys sharing the pattern's literal prefix
+        pat = os.path.normcase(pattern)
+        prefix = _GLOB_LITERAL_PREFIX_RE.match(pat).group(0)
+        start = bisect.bisect_left(norms, prefix)
+        end = start
+        while end < len(norms) and norms[end].startswith(prefix):
+            end += 1
+        # "prefix*" matches the whole range ('*' spans '/' too); only other patterns need the regex
+        if pat == prefix + '*':
+            return keys[start:end]
+        match = _glob_matcher(pat)
+        return [keys[i] for i in range(start, end) if match(norms[i])]
 
     def get_entry_details(self, title):
-        if title and title.lower() in self.yaml_entries:
-            return self.yaml_entries[title.lower()]
+        # One lowercase and one hash probe; entries are always dicts, so None means a miss
+        if title:
+            entry = self.yaml_entries.get(title.lower())
+            if entry is not None:
+                return entry
         return self.yaml_entries.get(title)
 
+# Seeded selection syntax: #<seed>[|<seed>...]$$<tag>
+_SEED_RE = re.compile(r'#([0-9|]+)\$\$(.*)')
+
+# Per-selector cap on cached weight tables; load_tags can return fresh lists (globs, merged YAML prompts)
+_WEIGHT_TABLES_MAX = 64
+
+def _used_key(item):
+    """used_values key for a wildcard item: parsed TXT lines are dicts, keyed by their value."""
+    if isinstance(item, dict):
+        return item.get('value')
+    return item
+
 class TagSelector(TagSelectorBase):
     def __init__(self, tag_loader, options):
         super().__init__(tag_loader, options)
@@ -712,6 +815,8 @@ class TagSelector(TagSelectorBase):
         self.processing_stack = set()
         self.resolved_seeds = {}
         self.selected_entries = {} 
+        # id(list) -> (list, len, weight table) for loaded wildcard lists, oldest first; see _weight_table
+        self._weight_tables = {}
 
     def _set_yaml_vars(self, title, entry_details):
         if not UMI_SETTINGS.get('yaml_namespace', True):
@@ -741,20 +846,44 @@ class TagSelector(TagSelectorBase):
         self.selected_entries.clear()
         self.scoped_negatives = []
 
-    def _weighted_choice(self, items, rng=None):
+    def _unused_choices(self, tags):
+        """Items of tags whose value hasn't been picked yet; tags itself (no copy) before any pick."""
+        used = self.used_values
+        if not used:
+            return tags
+        return [t for t in tags if _used_key(t) not in used]
+
+    def _weight_table(self, items, cache=False):
+        """(running weight totals, total) for weighted items, None if unweighted; kept per list when cache is set."""
+        if cache:
+            hit = self._weight_tables.pop(id(items), None)
+            if hit is not None and hit[0] is items and hit[1] == len(items):
+                # Reinsert so the most recently used tables are evicted last
+                self._weight_tables[id(items)] = hit
+                return hit[2]
+        table = None
+        if all(isinstance(item, dict) and 'weight' in item for item in items):
+            weights = [item.get('weight', 1.0) for item in items]
+            table = (list(itertools.accumulate(weights)), sum(weights))
+        if cache:
+            tables = self._weight_tables
+            if len(tables) >= _WEIGHT_TABLES_MAX:
+                del tables[next(iter(tables))]
+            tables[id(items)] = (items, len(items), table)
+        return table
+
+    def _weighted_choice(self, items, rng=None, cache=False):
         """Fix 13: Weighted random selection for lists with weights"""
-        # Check if items have weights
-        has_weights = all(isinstance(item, dict) and 'weight' in item for item in items)
+        # cache=True when items is a full wildcard list reused across picks, not a filtered copy
+        table = self._weight_table(items, cache)
 
-        if not has_weights:
+        if table is None:
             # Fall back to normal choice for strings or unweighted dicts
             return (rng or self.rng).choice(items)
 
         # Weighted selection
-        weights = [item.get('weight', 1.0) for item in items]
-        total_weight = sum(weights)
+        cumulative, total_weight = table
         rand_val = (rng or self.rng).random() * total_weight
-        cumsum = 0
 
         if self.is_debug_enabled():
             self.variables['debug_last_roll'] = f"{rand_val:.6f}"
@@ -764,10 +893,10 @@ class TagSelector(TagSelectorBase):
             "trace_last_total_weight": f"{total_weight:.6f}",
         })
 
-        for item in items:
-            cumsum += item.get('weight', 1.0)
-            if rand_val <= cumsum:
-                return item
+        # First item whose running total reaches the roll, same as a linear scan
+        index = bisect.bisect_left(cumulative, rand_val)
+        if index < len(items):
+            return items[index]
 
         return items[-1]  # Fallback
 
@@ -824,6 +953,9 @@ class TagSelector(TagSelectorBase):
         if not isinstance(tags, list):
             return ""
 
+        # Weight tables are only worth keeping for the list load_tags handed in, not a filtered copy
+        loaded_tags = tags
+
         # Phase 5: Filter entries by logic expression if provided
         if logic_filter:
             from .nodes_lite import LogicEvaluator  # Import shared evaluator
@@ -847,8 +979,9 @@ class TagSelector(TagSelectorBase):
                 return f"[NO_MATCHES: {logic_filter} in {parsed_tag}]"
 
             tags = filtered_tags
+        cache_weights = tags is loaded_tags
         
-        seed_match = re.match(r'#([0-9|]+)\$\$(.*)', parsed_tag)
+        seed_match = _SEED_RE.match(parsed_tag)
         if seed_match:
             seed_options = seed_match.group(1).split('|')
             chosen_seed = rng.choice(seed_options)
@@ -857,21 +990,21 @@ class TagSelector(TagSelectorBase):
                 selected = self.seeded_values[chosen_seed]
                 return self.resolve_wildcard_recursively(selected, chosen_seed)
             
-            unused = [t for t in tags if t not in self.used_values]
+            unused = self._unused_choices(tags)
             # Fix 13: Use weighted choice if tags have weights
-            selected = self._weighted_choice(unused, rng=rng) if unused else self._weighted_choice(tags, rng=rng)
+            selected = self._weighted_choice(unused, rng=rng, cache=cache_weights and unused is tags) if unused else self._weighted_choice(tags, rng=rng, cache=cache_weights)
 
             self.seeded_values[chosen_seed] = selected
-            self.used_values[selected] = True
+            self.used_values[_used_key(selected)] = True
             return self.resolve_wildcard_recursively(selected, chosen_seed)
 
         selected = None
         if len(tags) == 1:
             selected = tags[0]
         else:
-            unused = [t for t in tags if t not in self.used_values]
+            unused = self._unused_choices(tags)
             # Fix 13: Use weighted choice if tags have weights
-            selected = self._weighted_choice(unused, rng=rng) if unused else self._weighted_choice(tags, rng=rng)
+            selected = self._weighted_choice(unused, rng=rng, cache=cache_weights and unused is tags) if unused else self._weighted_choice(tags, rng=rng, cache=cache_weights)
 
         if selected:
             # Fix 13: Extract value if selected is a weighted dict
@@ -896,7 +1029,7 @@ class TagSelector(TagSelectorBase):
                 if entry_details['prompts']:
                     selected_key = rng.choice(entry_details['prompts'])
             if isinstance(selected_key, str) and '#' in selected_key:
-                selected_key = selected_key.split('#')[0].strip()
+                selected_key = selected_key.partition('#')[0].strip()
             selected_key = self.process_scoped_negative(selected_key)
             if self.is_debug_enabled():
                 self.variables['debug_last_type'] = "wildcard"
@@ -947,9 +1080,11 @@ class TagSelector(TagSelectorBase):
             else:
                 resolved_groups.append(clean_g)
 
-        neg_groups = {x.replace('--', '').strip().lower() for x in resolved_groups if x.startswith('--')}
-        pos_groups = {x.strip().lower() for x in resolved_groups if not x.startswith('--') and '|' not in x}
-        any_groups = [{y.strip() for y in x.lower().split('|')} for x in resolved_groups if '|' in x]
+        # Lowercase each group once, then split it into the three kinds
+        lowered = [x.lower() for x in resolved_groups]
+        neg_groups = {x.replace('--', '').strip() for x in lowered if x.startswith('--')}
+        pos_groups = {x.strip() for x in lowered if not x.startswith('--') and '|' not in x}
+        any_groups = [{y.strip() for y in x.split('|')} for x in lowered if '|' in x]
 
         candidates = []
         for title, entry_data in tags.items():
@@ -970,7 +1105,7 @@ class TagSelector(TagSelectorBase):
             candidates.append(title)
 
         if candidates:
-            seed_match = re.match(r'#([0-9|]+)\$\$(.*)', parsed_tag)
+            seed_match = _SEED_RE.match(parsed_tag)
             seed_id = seed_match.group(1) if seed_match else None
             
             selected_title = rng.choice(candidates)
@@ -1119,7 +1254,7 @@ class TagSelector(TagSelectorBase):
                      vars_out.append(f"${k.strip()}={v.strip()}")
                  return " ".join(vars_out)
             if '#' in selected:
-                selected = selected.split('#')[0].strip()
+                selected = selected.partition('#')[0].strip()
             selected = self.process_scoped_negative(selected)
             if self.is_debug_enabled():
                 self.variables['debug_last_type'] = "wildcard"
@@ -1294,7 +1429,7 @@ class TagReplacer(TagReplacerBase):
         
         if selected is not None:
             if isinstance(selected, str) and '#' in selected:
-                selected = selected.split('#')[0].strip()
+                selected = selected.partition('#')[0].strip()
             return str(selected) 
             
         return matches.group(0)
@@ -1584,8 +1719,9 @@ class LoRAHandler:
         if limit == 0:
             return comfy.utils.load_torch_file(lora_path, safe_load=True)
 
-        if lora_path in LORA_MEMORY_CACHE:
-            data = LORA_MEMORY_CACHE.pop(lora_path)
+        # Pop and re-insert to mark the hit as most recent
+        data = LORA_MEMORY_CACHE.pop(lora_path, None)
+        if data is not None:
             LORA_MEMORY_CACHE[lora_path] = data
             return data
 
@@ -1593,7 +1729,7 @@ class LoRAHandler:
 
         LORA_MEMORY_CACHE[lora_path] = lora
         while len(LORA_MEMORY_CACHE) > limit:
-            LORA_MEMORY_CACHE.popitem(last=False)
+            del LORA_MEMORY_CACHE[next(iter(LORA_MEMORY_CACHE))]
 
         return lora
 
@@ -1675,6 +1811,10 @@ class NegativePromptGenerator(shared_utils.NegativePromptGenerator):
 # NODE DEFINITION
 # ==============================================================================
 
+# Final prompt cleanup, run on every generation
+_EMPTY_COMMA_RE = re.compile(r',\s*,')
+_WHITESPACE_RE = re.compile(r'\s+')
+
 class UmiAIWildcardNode:
     def __init__(self):
         self.loaded = False
@@ -1773,6 +1913,7 @@ class UmiAIWildcardNode:
         if model_choice in DOWNLOADABLE_MODELS:
             if not HF_HUB_AVAILABLE:
                 return None, None
+            from huggingface_hub import hf_hub_download
             
             model_info = DOWNLOADABLE_MODELS[model_choice]
             repo_id = model_info["repo_id"]
@@ -2199,8 +2340,8 @@ class UmiAIWildcardNode:
             neg_gen.add_list(tag_selector.scoped_negatives)
 
         prompt = neg_gen.strip_negative_tags(prompt)
-        prompt = re.sub(r',\s*,', ',', prompt)
-        prompt = re.sub(r'\s+', ' ', prompt).strip().strip(',')
+        prompt = _EMPTY_COMMA_RE.sub(',', prompt)
+        prompt = _WHITESPACE_RE.sub(' ', prompt).strip().strip(',')
 
         if tag_selector.is_trace_enabled():
             prompt = append_trace_summary(prompt, variable_replacer.variables)
@@ -2214,7 +2355,7 @@ class UmiAIWildcardNode:
         if generated_negatives:
             final_negative = f"{final_negative}, {generated_negatives}" if final_negative else generated_negatives
         if final_negative:
-            final_negative = re.sub(r',\s*,', ',', final_negative).strip()
+            final_negative = _EMPTY_COMMA_RE.sub(',', final_negative).strip()
 
         prompt, settings = self.extract_settings(prompt)
         final_width = settings['width'] if settings['width'] > 0 else width
@@ -3239,91 +3380,165 @@ NODE_DISPLAY_NAME_MAPPINGS = {
     "UmiVisualCameraControl": "Umi Visual Camera Control"
 }
 
+def invalidate_changed_wildcards():
+    """
+    Prepare the full node caches for a refresh without throwing away unchanged work.
+    Cached file contents are dropped only when their file changed or vanished, and the
+    index is marked for a rebuild that re-parses only YAML files with a new mtime.
+    """
+    drop_stale_cache_entries(GLOBAL_CACHE, FILE_MTIME_CACHE)
+    for path in list(YAML_INDEX_CACHE.keys()):
+        if not os.path.exists(path):
+            del YAML_INDEX_CACHE[path]
+    for path in list(YAML_TAGS_CACHE.keys()):
+        if not os.path.exists(path):
+            del YAML_TAGS_CACHE[path]
+    TagLoader.invalidate()
+    GLOBAL_INDEX['built'] = False
+
 # ==============================================================================
 # API ENDPOINTS
 # ==============================================================================
 
-@server.PromptServer.instance.routes.get("/umiapp/wildcards")
-async def get_wildcards(request):
-    # Respect use_folder_paths setting from UMI_SETTINGS (updated by node toggle)
-    use_folder_paths = UMI_SETTINGS.get('use_folder_paths', False)
-    print(f"[UmiAI API] /umiapp/wildcards called. UMI_SETTINGS['use_folder_paths'] = {use_folder_paths}")
-    
-    all_paths = get_all_wildcard_paths()
-    options = {'use_folder_paths': use_folder_paths, 'verbose': False}
-    loader = TagLoader(all_paths, options)
-    loader.build_index()
-    
-    # Separate txt files from yaml for proper autocomplete
-    txt_files = []
-    yaml_files = []
-    tags = set()
-    basenames = {}
-    
+def _walk_wildcard_tree(root):
+    """Yield (rel_path, DirEntry) for every non-hidden file below root; rel_path uses '/'."""
+    # Relative paths are built up per directory instead of relpath() per file
+    stack = [(root, '')]
+    while stack:
+        directory, rel_prefix = stack.pop()
+        try:
+            it = os.scandir(directory)
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.name.startswith('.'):
+                    continue
+                if entry.is_dir():
+                    stack.append((entry.path, f"{rel_prefix}{entry.name}/"))
+                elif entry.is_file():
+                    yield rel_prefix + entry.name, entry
+
+# Serializes index builds from concurrent API requests now that they run in executor threads
+_TAG_INDEX_LOCK = threading.Lock()
+
+def _build_tag_loader(use_folder_paths):
+    """TagLoader over every wildcard path with its index built (walks and parses on a cold index)."""
+    with _TAG_INDEX_LOCK:
+        loader = TagLoader(get_all_wildcard_paths(), {'use_folder_paths': use_folder_paths, 'verbose': False})
+        loader.build_index()
+    return loader
+
+def _refresh_tag_index(use_folder_paths):
+    with _TAG_INDEX_LOCK:
+        invalidate_changed_wildcards()
+    _WILDCARD_LISTING['key'] = None
+    loader = _build_tag_loader(use_folder_paths)
+    return sorted(loader.files_index | loader.umi_tags)
+
+# Memoized /umiapp/wildcards listing, keyed by use_folder_paths, every TXT path and every YAML's (path, mtime, size)
+_WILDCARD_LISTING = {'key': None, 'data': None}
+_WILDCARD_LISTING_LOCK = threading.Lock()
+
+def _wildcard_listing(all_paths, use_folder_paths):
+    """Autocomplete files, YAML names, tags and basenames; only new or changed YAMLs are reparsed."""
+    roots = []
+    key = [use_folder_paths]
     for path in all_paths:
         if not os.path.exists(path):
             continue
-            
+        txt_found = []
+        yaml_found = []
+        for rel_path, entry in _walk_wildcard_tree(path):
+            if entry.name.endswith('.txt'):
+                txt_found.append((rel_path, entry.name))
+                key.append(entry.path)
+            elif entry.name.endswith('.yaml'):
+                st = entry.stat()
+                yaml_found.append((rel_path, entry.name, entry.path, st))
+                key.append((entry.path, st.st_mtime_ns, st.st_size))
+        roots.append((txt_found, yaml_found))
+    key = tuple(key)
+
+    with _WILDCARD_LISTING_LOCK:
+        if _WILDCARD_LISTING['key'] == key:
+            return _WILDCARD_LISTING['data']
+
+    # Separate txt files from yaml for proper autocomplete (sets; both are sorted on the way out)
+    txt_files = set()
+    yaml_files = set()
+    tags = set()
+    basenames = {}
+    
+    # YAMLs are handled after each root's TXTs so TXT basenames keep priority
+    for txt_found, yaml_found in roots:
         # Scan TXT files (for __ wildcards)
-        for filepath in glob.glob(os.path.join(path, '**', '*.txt'), recursive=True):
-            if use_folder_paths:
-                # Full path mode: Series/A Centaur's Life
-                rel_path = os.path.relpath(filepath, path)
-                tag_name = os.path.splitext(rel_path)[0].replace(os.sep, '/')
-            else:
-                # Filename only mode: A Centaur's Life
-                tag_name = os.path.splitext(os.path.basename(filepath))[0]
+        for rel_path, name in txt_found:
+            basename = name[:-4]
+            # Full path mode: Series/A Centaur's Life; filename only mode: A Centaur's Life
+            tag_name = rel_path[:-4] if use_folder_paths else basename
             
-            if tag_name not in txt_files:
-                txt_files.append(tag_name)
+            txt_files.add(tag_name)
             
             # Add basename mapping
-            basename = os.path.splitext(os.path.basename(filepath))[0]
             if basename not in basenames:
                 basenames[basename] = tag_name
         
         # Scan YAML files (for tags)
-        for filepath in glob.glob(os.path.join(path, '**', '*.yaml'), recursive=True):
-            if use_folder_paths:
-                # Full path mode
-                rel_path = os.path.relpath(filepath, path)
-                tag_name = os.path.splitext(rel_path)[0].replace(os.sep, '/')
-            else:
-                # Filename only mode
-                tag_name = os.path.splitext(os.path.basename(filepath))[0]
+        for rel_path, name, filepath, st in yaml_found:
+            basename = name[:-5]
+            tag_name = rel_path[:-5] if use_folder_paths else basename
             
-            if tag_name not in yaml_files:
-                yaml_files.append(tag_name)
+            yaml_files.add(tag_name)
             
             # Add basename mapping
-            basename = os.path.splitext(os.path.basename(filepath))[0]
             if basename not in basenames:
                 basenames[basename] = tag_name
             
-            # Parse YAML for Tags
+            # Scrape entry names and Tags from parser events; no full document is built
             try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    data = yaml.safe_load(f)
-                    if isinstance(data, dict):
-                        for entry_name, entry in data.items():
-                            # Add entry names as searchable (for <EntryName>)
-                            tags.add(str(entry_name).strip())
-                            # Also add Tags field if present
-                            if isinstance(entry, dict) and 'Tags' in entry:
-                                for t in entry['Tags']:
-                                    tags.add(str(t).strip())
+                yaml_tags, entry_names = _parse_yaml_tags_cached(filepath, st)
             except Exception as e:
                 print(f"[UmiAI] Error parsing YAML {filepath}: {e}")
-    
-    loras = folder_paths.get_filename_list("loras")
-    loras = sorted(loras) if loras else []
-
-    return web.json_response({
-        "files": sorted(txt_files),
-        "wildcards": sorted(txt_files),
+                continue
+            # Add entry names as searchable (for <EntryName>), plus any Tags fields
+            tags.update(entry_name.strip() for entry_name in entry_names)
+            tags.update(yaml_tags)
+
+    # "files" and "wildcards" share one sorted list; the listing is cached, never mutated
+    txt_sorted = sorted(txt_files)
+    listing = {
+        "files": txt_sorted,
+        "wildcards": txt_sorted,
         "yaml_files": sorted(yaml_files),
-        "tags": sorted(list(tags)),
+        "tags": sorted(tags),
         "basenames": basenames,
+    }
+    with _WILDCARD_LISTING_LOCK:
+        _WILDCARD_LISTING['key'] = key
+        _WILDCARD_LISTING['data'] = listing
+    return listing
+
+def _sorted_lora_names():
+    # folder_paths caches the list itself and revalidates it against every LoRA folder's mtime
+    loras = folder_paths.get_filename_list("loras")
+    return sorted(loras) if loras else []
+
+@server.PromptServer.instance.routes.get("/umiapp/wildcards")
+async def get_wildcards(request):
+    # Respect use_folder_paths setting from UMI_SETTINGS (updated by node toggle)
+    use_folder_paths = UMI_SETTINGS.get('use_folder_paths', False)
+    print(f"[UmiAI API] /umiapp/wildcards called. UMI_SETTINGS['use_folder_paths'] = {use_folder_paths}")
+    
+    # Index warm-up, the tree walk and any YAML parsing stay off the event loop
+    loop = asyncio.get_running_loop()
+    all_paths = await loop.run_in_executor(None, get_all_wildcard_paths)
+    await loop.run_in_executor(None, _build_tag_loader, use_folder_paths)
+    listing = await loop.run_in_executor(None, _wildcard_listing, all_paths, use_folder_paths)
+    loras = await loop.run_in_executor(None, _sorted_lora_names)
+
+    return _json_response({
+        **listing,
         "loras": loras,
         "use_folder_paths": use_folder_paths,  # Include setting so frontend knows
     })
@@ -3375,29 +3590,31 @@ async def get_loras_metadata(request):
         
         # Check for .json file next to the LoRA
         json_path = lora_base_path + ".json"
-        if os.path.exists(json_path):
-            try:
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    local_metadata = json.load(f)
-            except Exception as e:
-                print(f"[Umi LoRA Browser] Error loading local JSON for {base_name}: {e}")
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                local_metadata = json.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"[Umi LoRA Browser] Error loading local JSON for {base_name}: {e}")
         
         # Check for .civitai.info file (SD-CivitAI Helper format)
         # Format: "LoRAName.civitai.info" - contains "activation text" field
         civitai_info_path = lora_base_path + ".civitai.info"
-        if os.path.exists(civitai_info_path):
-            try:
-                with open(civitai_info_path, 'r', encoding='utf-8') as f:
-                    civitai_info = json.load(f)
-                    # Extract activation text if present
-                    activation_text = civitai_info.get("activation text", "")
-                    if activation_text:
-                        civitai_info_tags = [t.strip() for t in activation_text.split(",") if t.strip()]
-                    # Store full civitai info in local_metadata if not already set
-                    if not local_metadata:
-                        local_metadata = civitai_info
-            except Exception as e:
-                print(f"[Umi LoRA Browser] Error loading .civitai.info for {base_name}: {e}")
+        try:
+            with open(civitai_info_path, 'r', encoding='utf-8') as f:
+                civitai_info = json.load(f)
+                # Extract activation text if present
+                activation_text = civitai_info.get("activation text", "")
+                if activation_text:
+                    civitai_info_tags = [t.strip() for t in activation_text.split(",") if t.strip()]
+                # Store full civitai info in local_metadata if not already set
+                if not local_metadata:
+                    local_metadata = civitai_info
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"[Umi LoRA Browser] Error loading .civitai.info for {base_name}: {e}")
         
         # Check for preview images (common formats)
         for ext in ['.preview.png', '.preview.jpg', '.preview.jpeg', '.preview.webp', 
@@ -3431,7 +3648,7 @@ async def get_loras_metadata(request):
 
         lora_data.append(lora_info)
 
-    return web.json_response({"loras": lora_data})
+    return _json_response({"loras": lora_data})
 
 @server.PromptServer.instance.routes.get("/umiapp/preview")
 async def serve_lora_preview(request):
@@ -3470,35 +3687,41 @@ async def serve_lora_preview(request):
 
 @server.PromptServer.instance.routes.post("/umiapp/refresh")
 async def refresh_wildcards(request):
-    GLOBAL_CACHE.clear()
-    
-    GLOBAL_INDEX['built'] = False 
-    GLOBAL_INDEX['files'] = set()
-    GLOBAL_INDEX['entries'] = {}
-    GLOBAL_INDEX['tags'] = set()
-    
-    all_paths = get_all_wildcard_paths()
-    options = {'use_folder_paths': UMI_SETTINGS.get('use_folder_paths', False), 'verbose': False}
-    loader = TagLoader(all_paths, options)
-    loader.build_index() 
+    # Stat checks and the index rebuild stay off the event loop
+    loop = asyncio.get_running_loop()
+    combined_list = await loop.run_in_executor(None, _refresh_tag_index, UMI_SETTINGS.get('use_folder_paths', False))
+    loras = await loop.run_in_executor(None, _sorted_lora_names)
     
-    combined_list = sorted(list(loader.files_index | loader.umi_tags))
-    
-    loras = folder_paths.get_filename_list("loras")
-    loras = sorted(loras) if loras else []
-    
-    return web.json_response({
+    return _json_response({
         "status": "success",
         "count": len(combined_list),
         "wildcards": combined_list,
         "loras": loras
     })
 
+# One CivitAI client for the LoRA browser so lookups reuse pooled connections and cached DNS
+_civitai_session = None
+
+async def _get_civitai_session():
+    global _civitai_session
+    import aiohttp
+    if _civitai_session is None or _civitai_session.closed:
+        _civitai_session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=8, ttl_dns_cache=300))
+    return _civitai_session
+
+async def _close_civitai_session(app):
+    if _civitai_session is not None and not _civitai_session.closed:
+        await _civitai_session.close()
+
+try:
+    server.PromptServer.instance.app.on_cleanup.append(_close_civitai_session)
+except (AttributeError, RuntimeError):
+    pass
+
 @server.PromptServer.instance.routes.post("/umiapp/loras/civitai/batch")
 async def fetch_civitai_batch(request):
     """Phase 6: Batch fetch CivitAI metadata for all LoRAs with rate limiting"""
     import aiohttp
-    import asyncio
 
     loras = folder_paths.get_filename_list("loras")
     if not loras:
@@ -3648,17 +3871,17 @@ async def fetch_civitai_batch(request):
             print(f"[Umi LoRA Browser] Error fetching {base_name}: {e}")
 
     try:
-        async with aiohttp.ClientSession() as session:
-            # Process in batches to avoid overwhelming CivitAI
-            batch_size = 5
-            for i in range(0, len(loras), batch_size):
-                batch = loras[i:i+batch_size]
-                tasks = [fetch_one(session, lora_name) for lora_name in batch]
-                await asyncio.gather(*tasks)
-
-                # Save cache after each batch
-                with open(cache_path, 'w', encoding='utf-8') as f:
-                    json.dump(cache, f, indent=2, ensure_ascii=False)
+        session = await _get_civitai_session()
+        # Process in batches to avoid overwhelming CivitAI
+        batch_size = 5
+        for i in range(0, len(loras), batch_size):
+            batch = loras[i:i+batch_size]
+            tasks = [fetch_one(session, lora_name) for lora_name in batch]
+            await asyncio.gather(*tasks)
+
+            # Save cache after each batch
+            with open(cache_path, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, indent=2, ensure_ascii=False)
 
         return web.json_response({"success": True, "results": results})
 
@@ -3694,84 +3917,84 @@ async def fetch_civitai_single(request):
         if base_name in cache:
             return web.json_response({"success": True, "cached": True, "data": cache[base_name]})
         
-        async with aiohttp.ClientSession() as session:
-            # Get file path and hash
-            lora_path = folder_paths.get_full_path("loras", lora_name)
-            if not lora_path:
-                # Try with .safetensors extension
-                lora_path = folder_paths.get_full_path("loras", f"{lora_name}.safetensors")
-            
-            file_hash = None
-            if lora_path:
-                lora_handler = LoRAHandler()
-                file_hash = lora_handler.get_lora_hash(lora_path)
-            
-            model = None
-            
-            # Try hash-based lookup first
-            if file_hash:
-                hash_url = f"https://civitai.com/api/v1/model-versions/by-hash/{file_hash}"
-                try:
-                    async with session.get(hash_url, timeout=aiohttp.ClientTimeout(total=10)) as resp:
-                        if resp.status == 200:
-                            version_data = await resp.json()
-                            model_id = version_data.get("modelId")
-                            if model_id:
-                                model_url = f"https://civitai.com/api/v1/models/{model_id}"
-                                async with session.get(model_url, timeout=aiohttp.ClientTimeout(total=10)) as model_resp:
-                                    if model_resp.status == 200:
-                                        model = await model_resp.json()
-                except Exception as e:
-                    print(f"[Umi LoRA Browser] Hash lookup failed: {e}")
-            
-            # Fallback to name search - EXACT MATCH ONLY
-            if not model:
-                from urllib.parse import quote
-                search_url = f"https://civitai.com/api/v1/models?query={quote(base_name)}&types=LORA&limit=5"
-                
-                async with session.get(search_url, timeout=aiohttp.ClientTimeout(total=15)) as resp:
+        session = await _get_civitai_session()
+        # Get file path and hash
+        lora_path = folder_paths.get_full_path("loras", lora_name)
+        if not lora_path:
+            # Try with .safetensors extension
+            lora_path = folder_paths.get_full_path("loras", f"{lora_name}.safetensors")
+        
+        file_hash = None
+        if lora_path:
+            lora_handler = LoRAHandler()
+            file_hash = lora_handler.get_lora_hash(lora_path)
+        
+        model = None
+        
+        # Try hash-based lookup first
+        if file_hash:
+            hash_url = f"https://civitai.com/api/v1/model-versions/by-hash/{file_hash}"
+            try:
+                async with session.get(hash_url, timeout=aiohttp.ClientTimeout(total=10)) as resp:
                     if resp.status == 200:
-                        search_data = await resp.json()
-                        items = search_data.get("items", [])
-                        
-                        # Only accept exact name match - NO FALLBACK
-                        for item in items:
-                            if item.get("name", "").lower() == base_name.lower():
-                                model = item
-                                break
-                        
-                        # If no exact match, return not found (user can use Edit to add manually)
-            
-            if not model:
-                return web.json_response({"success": False, "error": "No exact match found. Use Edit to add manually."})
-            
-            # Extract CivitAI data
-            civitai_data = {
-                "id": model.get("id"),
-                "name": model.get("name"),
-                "description": model.get("description", "")[:300],
-                "tags": model.get("tags", [])[:15],
-                "creator": model.get("creator", {}).get("username", "Unknown"),
-                "url": f"https://civitai.com/models/{model.get('id')}",
-            }
-            
-            if model.get("modelVersions"):
-                latest_version = model["modelVersions"][0]
-                civitai_data["trigger_words"] = latest_version.get("trainedWords", [])[:15]
-                civitai_data["base_model"] = latest_version.get("baseModel", "Unknown")
-                
-                if latest_version.get("images"):
-                    first_image = latest_version["images"][0]
-                    civitai_data["preview_url"] = first_image.get("url")
-                    civitai_data["nsfw"] = first_image.get("nsfw", "None")
-            
-            # Save to cache
-            cache[base_name] = civitai_data
-            with open(cache_path, 'w', encoding='utf-8') as f:
-                json.dump(cache, f, indent=2, ensure_ascii=False)
+                        version_data = await resp.json()
+                        model_id = version_data.get("modelId")
+                        if model_id:
+                            model_url = f"https://civitai.com/api/v1/models/{model_id}"
+                            async with session.get(model_url, timeout=aiohttp.ClientTimeout(total=10)) as model_resp:
+                                if model_resp.status == 200:
+                                    model = await model_resp.json()
+            except Exception as e:
+                print(f"[Umi LoRA Browser] Hash lookup failed: {e}")
+        
+        # Fallback to name search - EXACT MATCH ONLY
+        if not model:
+            from urllib.parse import quote
+            search_url = f"https://civitai.com/api/v1/models?query={quote(base_name)}&types=LORA&limit=5"
             
-            return web.json_response({"success": True, "cached": False, "data": civitai_data})
+            async with session.get(search_url, timeout=aiohttp.ClientTimeout(total=15)) as resp:
+                if resp.status == 200:
+                    search_data = await resp.json()
+                    items = search_data.get("items", [])
+                    
+                    # Only accept exact name match - NO FALLBACK
+                    for item in items:
+                        if item.get("name", "").lower() == base_name.lower():
+                            model = item
+                            break
+                    
+                    # If no exact match, return not found (user can use Edit to add manually)
+        
+        if not model:
+            return web.json_response({"success": False, "error": "No exact match found. Use Edit to add manually."})
+        
+        # Extract CivitAI data
+        civitai_data = {
+            "id": model.get("id"),
+            "name": model.get("name"),
+            "description": model.get("description", "")[:300],
+            "tags": model.get("tags", [])[:15],
+            "creator": model.get("creator", {}).get("username", "Unknown"),
+            "url": f"https://civitai.com/models/{model.get('id')}",
+        }
+        
+        if model.get("modelVersions"):
+            latest_version = model["modelVersions"][0]
+            civitai_data["trigger_words"] = latest_version.get("trainedWords", [])[:15]
+            civitai_data["base_model"] = latest_version.get("baseModel", "Unknown")
             
+            if latest_version.get("images"):
+                first_image = latest_version["images"][0]
+                civitai_data["preview_url"] = first_image.get("url")
+                civitai_data["nsfw"] = first_image.get("nsfw", "None")
+        
+        # Save to cache
+        cache[base_name] = civitai_data
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, indent=2, ensure_ascii=False)
+        
+        return web.json_response({"success": True, "cached": False, "data": civitai_data})
+        
     except Exception as e:
         print(f"[Umi LoRA Browser] Single fetch error: {e}")
         return web.json_response({"error": str(e)}, status=500)
@@ -4266,7 +4489,6 @@ def _matches_filters(entry, filters):
 @server.PromptServer.instance.routes.get("/umiapp/images/scan")
 async def scan_images(request):
     """Phase 6: Scan output directory for images with metadata"""
-    import asyncio
     from PIL import Image as PILImage
     from PIL.PngImagePlugin import PngInfo
     from collections import Counter
@@ -4406,7 +4628,7 @@ async def scan_images(request):
         if not quick:
             _save_image_metadata_cache()
 
-        return web.json_response({
+        return _json_response({
             "images": paginated,
             "total": len(filtered_images),
             "offset": offset,
@@ -4528,7 +4750,7 @@ async def get_history(request):
         # Sort by timestamp descending (newest first)
         history.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
 
-        return web.json_response({"history": history})
+        return _json_response({"history": history})
     except Exception as e:
         print(f"[Umi History] Error loading history: {e}")
         return web.json_response({"history": []})
@@ -4590,7 +4812,7 @@ async def get_yaml_tags(request):
                 "entries": [e["name"] for e in export_data["entries"] if tag in e["tags"]]
             }
 
-        return web.json_response(export_data)
+        return _json_response(export_data)
 
     except Exception as e:
         print(f"[Umi YAML Tags] Error exporting tags: {e}")
@@ -4693,7 +4915,7 @@ async def list_files(request):
                         full_path = os.path.join(root, filename)
                         files.append(full_path)
 
-        return web.json_response({"files": files})
+        return _json_response({"files": files})
 
     except Exception as e:
         print(f"[Umi File Editor] Error listing files: {e}")
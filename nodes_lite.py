@@ -20,7 +20,8 @@ from .shared_utils import (
     escape_unweighted_colons, parse_wildcard_weight, log_prompt_to_history,
     LogicEvaluator, DynamicPromptReplacer, VariableReplacer, NegativePromptGenerator,
     ConditionalReplacer, TagLoaderBase, TagSelectorBase, LoRAHandlerBase, TagReplacerBase,
-    CharacterReplacer, resolve_lora_alias
+    CharacterReplacer, resolve_lora_alias, _YamlLoader, strip_double_slash_comments,
+    append_trace_summary, append_debug_summary
 )
 
 # Import UMI_SETTINGS from main nodes for syncing toggle
@@ -82,14 +83,16 @@ class TagLoader(TagLoaderBase):
                 continue
 
             for root, dirs, files in os.walk(wildcard_path):
+                # Folder prefix is built once per directory instead of relpath() per file
+                rel_dir = root[len(wildcard_path):].lstrip(os.sep).replace(os.sep, '/')
+                prefix = rel_dir + '/' if rel_dir else ''
                 for file in files:
                     if file.endswith(('.txt', '.yaml', '.yml', '.csv')):
                         # Toggle between filename-only and full path modes
                         full_path = os.path.join(root, file)
                         if self.use_folder_paths:
                             # Full path mode: __Series/A Centaur's Life__
-                            rel_path = os.path.relpath(full_path, wildcard_path)
-                            key = os.path.splitext(rel_path)[0].replace(os.sep, '/')
+                            key = prefix + os.path.splitext(file)[0]
                         else:
                             # Filename only mode: __A Centaur's Life__
                             key = os.path.splitext(file)[0]
@@ -107,7 +110,7 @@ class TagLoader(TagLoaderBase):
     def scan_yaml_for_tags(self, file_path):
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
+                data = yaml.load(f, Loader=_YamlLoader)
 
             if not data or not isinstance(data, dict):
                 print(f"[UmiAI Lite DEBUG] Skipping {os.path.basename(file_path)}: not a dict")
@@ -152,7 +155,7 @@ class TagLoader(TagLoaderBase):
             if os.path.exists(globals_file):
                 try:
                     with open(globals_file, 'r', encoding='utf-8') as f:
-                        data = yaml.safe_load(f)
+                        data = yaml.load(f, Loader=_YamlLoader)
 
                     if isinstance(data, dict):
                         for k, v in data.items():
@@ -187,6 +190,8 @@ class TagLoader(TagLoaderBase):
         
         for wildcard_path in self.wildcard_paths:
             for root, dirs, files in os.walk(wildcard_path):
+                rel_dir = root[len(wildcard_path):].lstrip(os.sep).replace(os.sep, '/')
+                prefix = rel_dir + '/' if rel_dir else ''
                 for file in files:
                     full_path = os.path.join(root, file)
                     
@@ -194,8 +199,7 @@ class TagLoader(TagLoaderBase):
                     name_without_ext = os.path.splitext(file)[0]
                     
                     # Path-based match: relative path from wildcard folder
-                    rel_path = os.path.relpath(full_path, wildcard_path)
-                    path_key = os.path.splitext(rel_path)[0].replace(os.sep, '/')
+                    path_key = prefix + name_without_ext
                     
                     # Match against either filename-only or full path
                     if name_without_ext.lower() == file_key_lower or path_key.lower() == file_key_lower:
@@ -250,22 +254,6 @@ class TagLoader(TagLoaderBase):
         with open(file_path, 'r', encoding='utf-8') as f:
             raw_lines = f.read().splitlines()
         lines = []
-        def strip_double_slash_comments(line):
-            i = 0
-            in_comment = False
-            out = []
-            while i < len(line):
-                if line[i] == '/' and i + 1 < len(line) and line[i + 1] == '/':
-                    in_comment = not in_comment
-                    i += 2
-                    continue
-                if in_comment:
-                    i += 1
-                    continue
-                out.append(line[i])
-                i += 1
-            return "".join(out).strip()
-
         for line in raw_lines:
             line = line.strip()
             if not line:
@@ -277,7 +265,7 @@ class TagLoader(TagLoaderBase):
                 if not line:
                     continue
             if '#' in line:
-                line = line.split('#')[0].strip()
+                line = line.partition('#')[0].strip()
             if line:
                 lines.append(line)
 
@@ -292,7 +280,7 @@ class TagLoader(TagLoaderBase):
     def load_yaml_file(self, file_path):
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
+                data = yaml.load(f, Loader=_YamlLoader)
 
             if not isinstance(data, dict):
                 print(f"[UmiAI Lite] WARNING: YAML file '{os.path.basename(file_path)}' does not contain a dictionary. Skipping.")
@@ -720,101 +708,6 @@ class TagReplacer(TagReplacerBase):
         return text
 
 
-def append_debug_summary(prompt, variables):
-    summary = variables.get('debug_summary')
-    if not summary or str(summary).strip() in ("0", "false", "False"):
-        return prompt
-
-    def _level(val):
-        if val is None:
-            return 1
-        if isinstance(val, (int, float)):
-            return max(0, int(val))
-        s = str(val).strip()
-        if s.isdigit():
-            return int(s)
-        if s.lower() in ("true", "yes", "on"):
-            return 1
-        return 0
-
-    level = _level(variables.get('debug'))
-    parts = [
-        "DBG",
-        f"seed={variables.get('debug_seed', '')}",
-        f"run={variables.get('debug_run_id', '')}",
-    ]
-    if variables.get('debug_last_type'):
-        parts.append(f"type={variables.get('debug_last_type')}")
-    if variables.get('debug_last_source'):
-        parts.append(f"src={variables.get('debug_last_source')}")
-    if variables.get('debug_last_pick'):
-        parts.append(f"pick={variables.get('debug_last_pick')}")
-    if level >= 2:
-        if variables.get('debug_last_count'):
-            parts.append(f"count={variables.get('debug_last_count')}")
-        if variables.get('debug_row_id'):
-            parts.append(f"row_id={variables.get('debug_row_id')}")
-        if variables.get('debug_row_index'):
-            parts.append(f"row={variables.get('debug_row_index')}")
-        if variables.get('debug_yaml_entry'):
-            parts.append(f"yaml={variables.get('debug_yaml_entry')}")
-        if variables.get('debug_last_roll') and variables.get('debug_last_total_weight'):
-            parts.append(f"roll={variables.get('debug_last_roll')}/{variables.get('debug_last_total_weight')}")
-
-    dbg_line = "<<{}>>".format(" | ".join(p for p in parts if p))
-    return f"{dbg_line}\n{prompt}"
-
-def append_trace_summary(prompt, variables):
-    summary = variables.get('trace_summary')
-    if not summary or str(summary).strip() in ("0", "false", "False"):
-        return prompt
-
-    def _level(val):
-        if val is None:
-            return 1
-        if isinstance(val, (int, float)):
-            return max(0, int(val))
-        s = str(val).strip()
-        if s.isdigit():
-            return int(s)
-        if s.lower() in ("true", "yes", "on"):
-            return 1
-        return 0
-
-    level = _level(variables.get('trace'))
-    parts = [
-        "TRACE",
-        f"seed={variables.get('trace_seed', '')}",
-        f"run={variables.get('trace_run_id', '')}",
-    ]
-    if variables.get('trace_last_type'):
-        parts.append(f"type={variables.get('trace_last_type')}")
-    if variables.get('trace_last_source'):
-        parts.append(f"src={variables.get('trace_last_source')}")
-    if variables.get('trace_last_pick'):
-        parts.append(f"pick={variables.get('trace_last_pick')}")
-    if level >= 2:
-        if variables.get('trace_row_id'):
-            parts.append(f"row_id={variables.get('trace_row_id')}")
-        if variables.get('trace_row_index'):
-            parts.append(f"row={variables.get('trace_row_index')}")
-        if variables.get('trace_yaml_entry'):
-            parts.append(f"yaml={variables.get('trace_yaml_entry')}")
-        if variables.get('trace_last_roll') and variables.get('trace_last_total_weight'):
-            parts.append(f"roll={variables.get('trace_last_roll')}/{variables.get('trace_last_total_weight')}")
-        if variables.get('trace_last_condition'):
-            parts.append(f"cond={variables.get('trace_last_condition')}")
-        if variables.get('trace_last_branch'):
-            parts.append(f"branch={variables.get('trace_last_branch')}")
-        if variables.get('trace_last_var') and variables.get('trace_last_var_source'):
-            parts.append(f"var={variables.get('trace_last_var')}:{variables.get('trace_last_var_source')}")
-
-    trace_line = "<<{}>>".format(" | ".join(p for p in parts if p))
-    return f"{trace_line}\n{prompt}"
-
-
-
-
 # ==============================================================================
 # LORA HANDLER
 # ==============================================================================
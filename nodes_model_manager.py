@@ -1,12 +1,10 @@
 import os
+import importlib.util
 import json
 import folder_paths
 
-try:
-    from huggingface_hub import hf_hub_download
-    HF_HUB_AVAILABLE = True
-except Exception:
-    HF_HUB_AVAILABLE = False
+# Imported on first use; huggingface_hub adds noticeably to startup time
+HF_HUB_AVAILABLE = importlib.util.find_spec("huggingface_hub") is not None
 
 
 class AnyType(str):
@@ -22,12 +20,26 @@ def resolve_path(relative_path):
     return os.path.abspath(os.path.join(base, relative_path))
 
 
+# path -> (mtime_ns, size, parsed JSON); the selector runs on every prompt and these rarely change
+_json_cache = {}
+
+
+def _load_json_cached(path):
+    st = os.stat(path)
+    hit = _json_cache.get(path)
+    if hit and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+        return hit[2]
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    _json_cache[path] = (st.st_mtime_ns, st.st_size, data)
+    return data
+
+
 def get_installed_version_info():
     registry_path = resolve_path("umi_installed_models.json")
     if os.path.exists(registry_path):
         try:
-            with open(registry_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return _load_json_cached(registry_path)
         except Exception:
             return {}
     return {}
@@ -77,11 +89,11 @@ class UmiModelSelector:
         if not HF_HUB_AVAILABLE:
             print("[UmiAI] ModelSelector Error: huggingface_hub is not installed.")
             return ("",)
+        from huggingface_hub import hf_hub_download
 
         try:
             path = hf_hub_download(repo_id=repo_id, filename="model_updater.json")
-            with open(path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _load_json_cached(path)
 
             models = data.get("models", [])
             target_name = str(model_name).strip()
@@ -14,6 +14,18 @@ import hashlib
 from datetime import datetime
 import time
 import folder_paths
+from aiohttp import web
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Prefer the libyaml-backed loader; fall back to the pure-Python one
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 
 # ==============================================================================
 # CONSTANTS
@@ -77,21 +89,193 @@ def _atomic_write_json(path, data, indent=2, ensure_ascii=False):
     base = os.path.basename(path)
     tmp_name = f".{base}.tmp.{os.getpid()}.{random.randint(0, 999999)}"
     tmp_path = os.path.join(directory, tmp_name)
-    with open(tmp_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=indent, ensure_ascii=ensure_ascii)
+    if orjson is not None and not ensure_ascii and indent in (None, 2):
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps(data, option=option))
+    else:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=indent, ensure_ascii=ensure_ascii)
     os.replace(tmp_path, path)
 
 
 def _read_json_file(path, default):
-    if not os.path.exists(path):
-        return default
+    # Missing files land in the except below; no separate exists() stat
     try:
+        if orjson is not None:
+            with open(path, 'rb') as f:
+                return orjson.loads(f.read())
         with open(path, 'r', encoding='utf-8') as f:
             return json.load(f)
     except Exception:
         return default
 
 
+def _json_body(data):
+    if orjson is None:
+        return json.dumps(data).encode('utf-8')
+    return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _json_response(data, status=200):
+    """web.json_response, serialized with orjson when it is installed."""
+    if orjson is None:
+        return web.json_response(data, status=status)
+    return web.Response(body=_json_body(data), status=status, content_type='application/json')
+
+
+def drop_stale_cache_entries(cache, mtime_cache):
+    """
+    Remove cached file data whose source file changed or disappeared.
+    Entries without a recorded mtime can't be validated and are dropped as well.
+    Returns the number of removed entries.
+    """
+    removed = 0
+    for key in list(cache.keys()):
+        info = mtime_cache.get(key) or {}
+        path = info.get('path')
+        try:
+            current_mtime = os.path.getmtime(path) if path else None
+        except OSError:
+            current_mtime = None
+        if current_mtime is None or current_mtime != info.get('mtime'):
+            cache.pop(key, None)
+            mtime_cache.pop(key, None)
+            removed += 1
+    for key in list(mtime_cache.keys()):
+        if key not in cache:
+            del mtime_cache[key]
+    return removed
+
+
+# Streaming scrape of entry Tags and top-level keys from wildcard YAML
+_YAML_RESOLVER = yaml.resolver.Resolver()
+
+
+class _NeedFullParse(Exception):
+    """Raised by the streaming tag scraper when only a full load gives the right answer."""
+
+
+def _scalar_text(event):
+    # Match str() of what safe_load would build (e.g. `yes` -> "True", `5` -> "5")
+    if event.implicit[0] and event.tag is None:
+        tag = _YAML_RESOLVER.resolve(yaml.ScalarNode, event.value, (True, False))
+        if tag != 'tag:yaml.org,2002:str':
+            return str(yaml.load(event.value, Loader=_YamlLoader))
+    return event.value
+
+
+def _skip_node(events, first):
+    if isinstance(first, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+        depth = 1
+        while depth:
+            event = next(events)
+            if isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+                depth += 1
+            elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+                depth -= 1
+
+
+def _extract_tags_stream(f):
+    """Collect entry Tags and top-level keys from parser events without building the document."""
+    tags = []
+    keys = []
+    events = yaml.parse(f, Loader=_YamlLoader)
+    next(events)  # StreamStart
+    if not isinstance(next(events), yaml.DocumentStartEvent):
+        return tags, keys
+    if not isinstance(next(events), yaml.MappingStartEvent):
+        return tags, keys
+
+    while True:
+        key = next(events)
+        if isinstance(key, yaml.MappingEndEvent):
+            return tags, keys
+        if not isinstance(key, yaml.ScalarEvent):
+            raise _NeedFullParse
+        keys.append(_scalar_text(key))
+        value = next(events)
+        if isinstance(value, yaml.AliasEvent):
+            raise _NeedFullParse
+        if not isinstance(value, yaml.MappingStartEvent):
+            _skip_node(events, value)
+            continue
+
+        while True:
+            field = next(events)
+            if isinstance(field, yaml.MappingEndEvent):
+                break
+            if not isinstance(field, yaml.ScalarEvent) or field.value == '<<':
+                raise _NeedFullParse
+            field_value = next(events)
+            if field.value != 'Tags':
+                _skip_node(events, field_value)
+                continue
+            if not isinstance(field_value, yaml.SequenceStartEvent):
+                raise _NeedFullParse
+            while True:
+                item = next(events)
+                if isinstance(item, yaml.SequenceEndEvent):
+                    break
+                if not isinstance(item, yaml.ScalarEvent):
+                    raise _NeedFullParse
+                tags.append(_scalar_text(item).strip())
+
+
+def _parse_yaml_tags(filepath):
+    """Return (tags, top-level keys) for a single wildcard YAML file."""
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return _extract_tags_stream(f)
+    except Exception:
+        pass
+
+    # Anchors, merge keys, odd Tags values or parse errors: defer to a full load
+    tags = []
+    keys = []
+    with open(filepath, 'r', encoding='utf-8') as f:
+        data = yaml.load(f, Loader=_YamlLoader)
+    if isinstance(data, dict):
+        for key, entry in data.items():
+            keys.append(str(key))
+            t_list = entry.get('Tags') if isinstance(entry, dict) else None
+            if t_list:
+                tags.extend(str(t).strip() for t in t_list)
+    return tags, keys
+
+
+# Parsed small config YAMLs (globals.yaml): path -> (mtime_ns, size, data); callers must not mutate data
+_YAML_DOC_CACHE = {}
+
+
+def _load_yaml_cached(path):
+    """yaml.load a config file, reusing the last result while its mtime and size are unchanged."""
+    st = os.stat(path)
+    hit = _YAML_DOC_CACHE.get(path)
+    if hit and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+        return hit[2]
+    with open(path, 'r', encoding='utf-8') as f:
+        data = yaml.load(f, Loader=_YamlLoader)
+    _YAML_DOC_CACHE[path] = (st.st_mtime_ns, st.st_size, data)
+    return data
+
+
+# Scraped (tags, keys) per YAML path, shared by both wildcard listings: path -> (mtime_ns, size, tags, keys)
+YAML_TAGS_CACHE = {}
+
+
+def _parse_yaml_tags_cached(filepath, st=None):
+    """_parse_yaml_tags, reusing the last result while the file's mtime and size are unchanged."""
+    if st is None:
+        st = os.stat(filepath)
+    cached = YAML_TAGS_CACHE.get(filepath)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2], cached[3]
+    tags, keys = _parse_yaml_tags(filepath)
+    YAML_TAGS_CACHE[filepath] = (st.st_mtime_ns, st.st_size, tags, keys)
+    return tags, keys
+
+
 def _normalize_aliases(data):
     wildcards = {}
     loras = {}
@@ -136,7 +320,7 @@ def load_aliases_from_paths(paths):
         else:
             try:
                 with open(alias_path, 'r', encoding='utf-8') as f:
-                    raw = yaml.safe_load(f) or {}
+                    raw = yaml.load(f, Loader=_YamlLoader) or {}
             except Exception:
                 raw = {}
             data = _normalize_aliases(raw)
@@ -325,6 +509,70 @@ def log_prompt_to_history(prompt, negative="", seed=None):
         print(f"[UmiAI] Warning: Could not log prompt to history: {e}")
 
 
+# Summary line fields: (label, key) or (label, key, paired key, separator); shown only when set
+_TRACE_FIELDS_L1 = (('type', 'trace_last_type'), ('src', 'trace_last_source'), ('pick', 'trace_last_pick'))
+_TRACE_FIELDS_L2 = (
+    ('row_id', 'trace_row_id'), ('row', 'trace_row_index'), ('yaml', 'trace_yaml_entry'),
+    ('roll', 'trace_last_roll', 'trace_last_total_weight', '/'),
+    ('cond', 'trace_last_condition'), ('branch', 'trace_last_branch'),
+    ('var', 'trace_last_var', 'trace_last_var_source', ':'),
+)
+_DEBUG_FIELDS_L1 = (('type', 'debug_last_type'), ('src', 'debug_last_source'), ('pick', 'debug_last_pick'))
+_DEBUG_FIELDS_L2 = (
+    ('count', 'debug_last_count'), ('row_id', 'debug_row_id'), ('row', 'debug_row_index'),
+    ('yaml', 'debug_yaml_entry'), ('roll', 'debug_last_roll', 'debug_last_total_weight', '/'),
+)
+_SUMMARY_OFF = frozenset(("0", "false", "False"))
+_SUMMARY_TRUTHY = frozenset(("true", "yes", "on"))
+
+
+def _summary_level(val):
+    """Verbosity of $trace/$debug: unset means 1, digits are taken as is, true/yes/on mean 1."""
+    if val is None:
+        return 1
+    if isinstance(val, (int, float)):
+        return max(0, int(val))
+    s = str(val).strip()
+    if s.isdigit():
+        return int(s)
+    return 1 if s.lower() in _SUMMARY_TRUTHY else 0
+
+
+def _append_summary(prompt, variables, prefix, label, fields_l1, fields_l2):
+    summary = variables.get(f'{prefix}_summary')
+    if not summary or str(summary).strip() in _SUMMARY_OFF:
+        return prompt
+
+    parts = [
+        label,
+        f"seed={variables.get(f'{prefix}_seed', '')}",
+        f"run={variables.get(f'{prefix}_run_id', '')}",
+    ]
+    fields = fields_l1 + fields_l2 if _summary_level(variables.get(prefix)) >= 2 else fields_l1
+    for name, key, *pair in fields:
+        value = variables.get(key)
+        if not value:
+            continue
+        if pair:
+            other = variables.get(pair[0])
+            if not other:
+                continue
+            value = f"{value}{pair[1]}{other}"
+        parts.append(f"{name}={value}")
+
+    return "<<{}>>\n{}".format(" | ".join(p for p in parts if p), prompt)
+
+
+def append_trace_summary(prompt, variables):
+    """Prefix the prompt with a <<TRACE ...>> line when $trace_summary is on."""
+    return _append_summary(prompt, variables, 'trace', "TRACE", _TRACE_FIELDS_L1, _TRACE_FIELDS_L2)
+
+
+def append_debug_summary(prompt, variables):
+    """Prefix the prompt with a <<DBG ...>> line when $debug_summary is on."""
+    return _append_summary(prompt, variables, 'debug', "DBG", _DEBUG_FIELDS_L1, _DEBUG_FIELDS_L2)
+
+
 def parse_tag(tag):
     """Parse and clean a wildcard tag"""
     if tag is None:
@@ -335,26 +583,19 @@ def parse_tag(tag):
     return tag
 
 
+# A `//` toggles comment mode; an unpaired one comments out the rest of the line
+_DOUBLE_SLASH_COMMENT_RE = re.compile(r'//.*?(?://|$)')
+
+
+def strip_double_slash_comments(line):
+    """Drop //inline comments// from a wildcard line."""
+    return _DOUBLE_SLASH_COMMENT_RE.sub('', line).strip()
+
+
 def read_file_lines(file):
     """Read and parse lines from a wildcard text file"""
     f_lines = file.read().splitlines()
     lines = []
-    def strip_double_slash_comments(line):
-        i = 0
-        in_comment = False
-        out = []
-        while i < len(line):
-            if line[i] == '/' and i + 1 < len(line) and line[i + 1] == '/':
-                in_comment = not in_comment
-                i += 2
-                continue
-            if in_comment:
-                i += 1
-                continue
-            out.append(line[i])
-            i += 1
-        return "".join(out).strip()
-
     for line in f_lines:
         line = line.strip()
         if not line:
@@ -366,7 +607,7 @@ def read_file_lines(file):
             if not line:
                 continue
         if '#' in line:
-            line = line.split('#')[0].strip()
+            line = line.partition('#')[0].strip()
 
         # Parse using shared utility function
         parsed = parse_wildcard_weight(line)
@@ -406,7 +647,7 @@ def process_wildcard_range(tag, lines, rng):
         if isinstance(selected, dict):
             selected = selected.get('value', '')
         if '#' in str(selected):
-            selected = str(selected).split('#')[0].strip()
+            selected = str(selected).partition('#')[0].strip()
         return selected
 
     range_str, tag_name = tag.split("$$", 1)
@@ -424,7 +665,7 @@ def process_wildcard_range(tag, lines, rng):
             else:
                 val = str(item)
             if '#' in val:
-                val = val.split('#')[0].strip()
+                val = val.partition('#')[0].strip()
             result.append(val)
         return ", ".join(result)
     except Exception as e:
@@ -433,7 +674,7 @@ def process_wildcard_range(tag, lines, rng):
         if isinstance(selected, dict):
             selected = selected.get('value', '')
         if '#' in str(selected):
-            selected = str(selected).split('#')[0].strip()
+            selected = str(selected).partition('#')[0].strip()
         return selected
 
 
@@ -1913,7 +2154,7 @@ class TagLoaderBase:
             if os.path.exists(global_path):
                 try:
                     with open(global_path, 'r', encoding='utf-8') as f:
-                        data = yaml.safe_load(f)
+                        data = yaml.load(f, Loader=_YamlLoader)
                         if isinstance(data, dict):
                             merged_globals.update({str(k): str(v) for k, v in data.items()})
                 except yaml.YAMLError as e:
@@ -2389,7 +2630,7 @@ class CharacterReplacer:
         # Load fresh
         try:
             with open(profile_path, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
+                data = yaml.load(f, Loader=_YamlLoader)
                 cls._cache[name] = data
                 cls._mtime_cache[name] = mtime
                 return data
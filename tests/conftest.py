@@ -0,0 +1,70 @@
+"""
+Load the node pack outside a running ComfyUI.
+
+Only the host application's own modules (folder_paths, server, comfy) are replaced with
+minimal stand-ins; everything in requirements.txt must be installed for real.
+Run from the repo root with `python -m pytest tests`.
+"""
+import importlib.util
+import os
+import sys
+import tempfile
+import types
+
+import pytest
+from aiohttp import web
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASE_PATH = tempfile.mkdtemp(prefix="umiai-tests-")
+
+
+def _install_host_modules():
+    folder_paths = types.ModuleType("folder_paths")
+    folder_paths.base_path = BASE_PATH
+    folder_paths.models_dir = os.path.join(BASE_PATH, "models")
+    folder_paths.folder_names_and_paths = {}
+    folder_paths.add_model_folder_path = lambda *args, **kwargs: None
+    folder_paths.get_filename_list = lambda *args, **kwargs: []
+    folder_paths.get_folder_paths = lambda *args, **kwargs: []
+    folder_paths.get_full_path = lambda *args, **kwargs: None
+    folder_paths.get_output_directory = lambda: BASE_PATH
+    folder_paths.get_input_directory = lambda: BASE_PATH
+    folder_paths.get_temp_directory = lambda: BASE_PATH
+
+    class PromptServer:
+        instance = types.SimpleNamespace(routes=web.RouteTableDef())
+
+    server = types.ModuleType("server")
+    server.PromptServer = PromptServer
+
+    comfy = types.ModuleType("comfy")
+    comfy.sd = types.ModuleType("comfy.sd")
+    comfy.utils = types.ModuleType("comfy.utils")
+
+    sys.modules.setdefault("folder_paths", folder_paths)
+    sys.modules.setdefault("server", server)
+    sys.modules.setdefault("comfy", comfy)
+    sys.modules.setdefault("comfy.sd", comfy.sd)
+    sys.modules.setdefault("comfy.utils", comfy.utils)
+
+
+def _load_package():
+    if "umiai" in sys.modules:
+        return sys.modules["umiai"]
+    _install_host_modules()
+    spec = importlib.util.spec_from_file_location(
+        "umiai", os.path.join(ROOT, "__init__.py"), submodule_search_locations=[ROOT])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["umiai"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def umiai():
+    return _load_package()
+
+
+@pytest.fixture(scope="session")
+def nodes(umiai):
+    return sys.modules["umiai.nodes"]
@@ -0,0 +1,68 @@
+import json
+import os
+
+
+def _write(path, data=b""):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def _write_meta(umiai, partial, **meta):
+    with open(umiai._partial_meta_path(partial), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+
+def test_no_partial(umiai, tmp_path):
+    target = str(tmp_path / "model.safetensors")
+    assert umiai._find_partial(target, "Model", 0, "1.0") == (None, 0, "")
+
+
+def test_resumes_partial_of_same_version(umiai, tmp_path):
+    target = str(tmp_path / "model.safetensors")
+    partial = f"{target}.umi-part"
+    _write(partial, b"x" * 10)
+    _write_meta(umiai, partial, version="1.0", etag='"abc"')
+
+    assert umiai._find_partial(target, "Model", 0, "1.0") == (partial, 10, '"abc"')
+    assert os.path.exists(partial)
+
+
+def test_restarts_partial_of_other_version(umiai, tmp_path):
+    target = str(tmp_path / "model.safetensors")
+    partial = f"{target}.umi-part"
+    _write(partial, b"x" * 10)
+    _write_meta(umiai, partial, version="1.0", etag='"abc"')
+
+    assert umiai._find_partial(target, "Model", 0, "2.0") == (None, 0, "")
+    assert not os.path.exists(partial)
+    assert not os.path.exists(umiai._partial_meta_path(partial))
+
+
+def test_restarts_partial_without_metadata(umiai, tmp_path):
+    target = str(tmp_path / "model.safetensors")
+    partial = f"{target}.umi-part"
+    _write(partial, b"x" * 10)
+
+    assert umiai._find_partial(target, "Model", 0, "1.0") == (None, 0, "")
+    assert not os.path.exists(partial)
+
+
+def test_skips_empty_partial(umiai, tmp_path):
+    target = str(tmp_path / "model.safetensors")
+    partial = f"{target}.umi-part"
+    _write(partial)
+    _write_meta(umiai, partial, version="1.0", etag="")
+
+    assert umiai._find_partial(target, "Model", 0, "1.0") == (None, 0, "")
+
+
+def test_finds_partial_in_comfy_temp(umiai, tmp_path):
+    target = str(tmp_path / "model.safetensors")
+    _, in_temp = umiai._partial_candidates(target, "My Model", 1)
+    _write(in_temp, b"x" * 4)
+    _write_meta(umiai, in_temp, version="1.0", etag="")
+    try:
+        assert umiai._find_partial(target, "My Model", 1, "1.0") == (in_temp, 4, "")
+    finally:
+        umiai._remove_partial(in_temp)
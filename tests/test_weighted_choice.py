@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+
+def _linear_weighted_choice(items, rng):
+    """The running-sum scan _weighted_choice used before its weight tables."""
+    if not all(isinstance(item, dict) and 'weight' in item for item in items):
+        return rng.choice(items)
+    weights = [item.get('weight', 1.0) for item in items]
+    rand_val = rng.random() * sum(weights)
+    cumsum = 0
+    for item in items:
+        cumsum += item.get('weight', 1.0)
+        if rand_val <= cumsum:
+            return item
+    return items[-1]
+
+
+@pytest.fixture
+def selector(nodes):
+    loader = nodes.TagLoader([], {'verbose': False})
+    return nodes.TagSelector(loader, {'seed': 0})
+
+
+def _random_lists(rng, count):
+    for n in range(count):
+        size = rng.randint(1, 30)
+        if n % 5 == 0:
+            yield [str(i) for i in range(size)]
+        else:
+            yield [{'value': str(i), 'weight': rng.choice([0, 0.5, 1, 2, 3.3, 1e-9])} for i in range(size)]
+
+
+@pytest.mark.parametrize("cache", [False, True])
+def test_matches_linear_scan(selector, cache):
+    rng = random.Random(1234)
+    for items in _random_lists(rng, 500):
+        for _ in range(5):
+            seed = rng.random()
+            expected = _linear_weighted_choice(items, random.Random(seed))
+            assert selector._weighted_choice(items, rng=random.Random(seed), cache=cache) is expected
+
+
+def test_cached_table_is_reused(selector):
+    items = [{'value': 'a', 'weight': 1}, {'value': 'b', 'weight': 3}]
+    table = selector._weight_table(items, cache=True)
+    assert selector._weight_table(items, cache=True) is table
+    assert table == ([1, 4], 4)
+
+
+def test_table_cache_is_bounded(nodes, selector):
+    for _ in range(nodes._WEIGHT_TABLES_MAX * 2):
+        selector._weight_table([{'value': 'a', 'weight': 1}], cache=True)
+    assert len(selector._weight_tables) == nodes._WEIGHT_TABLES_MAX
+
+
+def test_filtered_picks_are_not_cached(selector):
+    tags = [{'value': str(i), 'weight': 1, 'tags': ['even' if i % 2 == 0 else 'odd']} for i in range(6)]
+    for _ in range(10):
+        selector.get_tag_choice('letters', tags, logic_filter='even', rng=random.Random(0))
+    assert len(selector._weight_tables) == 0
@@ -0,0 +1,54 @@
+import pytest
+
+
+UNTAGGED = """\
+5:
+  Prompts: [five]
+yes:
+  Prompts: [truthy]
+~:
+  Prompts: [nothing]
+"quoted":
+  Prompts: [text]
+1.5: scalar value
+Plain Name:
+  Prompts: [plain]
+"""
+
+
+@pytest.fixture
+def loader(nodes, tmp_path, monkeypatch):
+    monkeypatch.setattr(nodes, "YAML_INDEX_CACHE", {})
+    return nodes.TagLoader([str(tmp_path)], {'verbose': False})
+
+
+def _index(nodes, loader, path):
+    nodes.YAML_INDEX_CACHE.clear()
+    return loader.index_yaml_file(str(path))
+
+
+def test_stream_and_full_load_keys_match(nodes, loader, tmp_path, monkeypatch):
+    path = tmp_path / "untagged.yaml"
+    path.write_text(UNTAGGED, encoding="utf-8")
+
+    streamed_keys, streamed_entries = _index(nodes, loader, path)
+
+    def no_stream(f):
+        raise nodes.shared_utils._NeedFullParse
+
+    monkeypatch.setattr(nodes, "_extract_tags_stream", no_stream)
+    loaded_keys, loaded_entries = _index(nodes, loader, path)
+
+    assert streamed_keys == loaded_keys == ["5", "True", "None", "quoted", "1.5", "Plain Name"]
+    assert streamed_entries == loaded_entries == {}
+
+
+def test_tagged_file_keys_are_text(nodes, loader, tmp_path):
+    path = tmp_path / "tagged.yaml"
+    path.write_text("5:\n  Tags: [number]\n  Prompts: [five]\nName:\n  Prompts: [plain]\n", encoding="utf-8")
+
+    keys, entries = _index(nodes, loader, path)
+
+    assert keys == ["5", "Name"]
+    assert list(entries) == ["5"]
+    assert entries["5"]['tags'] == ["number"]